@@ -15,9 +15,9 @@ from app.external.openrouter import OpenRouterClient, get_openrouter_client
 from app.services.document import ConvexDocumentProcessingService
 from app.services.note import NoteGenerationService, NoteService
 from app.services.question import QuestionTranslationService
-from app.services.rag import KeywordExtractor, QueryEnrichmentService, RAGService, RerankerService
+from app.services.rag import RAGService, get_rag_service
 from app.services.translation import TranslationService
-from app.services.tts import TTSService
+from app.services.tts import TTSService, get_tts_service
 
 
 # ===========================================
@@ -46,48 +46,6 @@ def get_convex_document_processing_service(
     return ConvexDocumentProcessingService(pinecone_client, embedding_service)
 
 
-def get_reranker_service() -> RerankerService:
-    """Get RerankerService instance (TinyBERT cross-encoder)."""
-    return RerankerService()
-
-
-def get_keyword_extractor() -> KeywordExtractor:
-    """Get KeywordExtractor instance (KeyBERT)."""
-    return KeywordExtractor()
-
-
-def get_query_enrichment_service(
-    keyword_extractor: Annotated[KeywordExtractor, Depends(get_keyword_extractor)],
-) -> QueryEnrichmentService:
-    """Get QueryEnrichmentService instance (uses KeyBERT for local keyword extraction)."""
-    return QueryEnrichmentService(keyword_extractor)
-
-
-def get_rag_service(
-    pinecone_client: PineconeClientDep,
-    embedding_service: LocalEmbeddingServiceDep,
-    convex_client: ConvexClientDep,
-    reranker: Annotated[RerankerService, Depends(get_reranker_service)],
-    query_enrichment: Annotated[QueryEnrichmentService, Depends(get_query_enrichment_service)],
-) -> RAGService:
-    """Get RAGService instance.
-    
-    Uses local models for low-latency RAG:
-    - bge-base-en-v1.5 for embeddings
-    - KeyBERT for keyword extraction
-    - TinyBERT for re-ranking
-    - Pinecone for vector search
-    - Convex for citation storage
-    """
-    return RAGService(
-        pinecone_client,
-        embedding_service,
-        convex_client,
-        reranker,
-        query_enrichment,
-    )
-
-
 def get_translation_service(
     elevenlabs_client: ElevenLabsClientDep,
 ) -> TranslationService:
@@ -102,13 +60,6 @@ def get_question_translation_service(
     return QuestionTranslationService(openrouter_client)
 
 
-def get_tts_service(
-    elevenlabs_client: ElevenLabsClientDep,
-) -> TTSService:
-    """Get TTSService instance."""
-    return TTSService(elevenlabs_client)
-
-
 def get_note_generation_service(
     openrouter_client: OpenRouterClientDep,
 ) -> NoteGenerationService:
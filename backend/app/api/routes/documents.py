@@ -14,6 +14,7 @@ from pydantic import BaseModel
 from app.api.deps import (
     PineconeClientDep,
     ConvexDocumentProcessingServiceDep,
+    RAGServiceDep,
 )
 
 logger = logging.getLogger(__name__)
@@ -58,6 +59,7 @@ class ConvexDocumentProcessResponse(BaseModel):
 async def process_convex_document(
     request: ConvexDocumentProcessRequest,
     processing_service: ConvexDocumentProcessingServiceDep,
+    rag_service: RAGServiceDep,
 ):
     """
     Process a document that's stored in Convex.
@@ -80,6 +82,9 @@ async def process_convex_document(
         file_url=request.file_url,
         file_name=request.file_name,
     )
+
+    # New chunks can change search results for windows already cached
+    rag_service.invalidate_session(request.session_id)
     
     return ConvexDocumentProcessResponse(
         document_id=request.document_id,
@@ -112,16 +117,16 @@ async def debug_pinecone_by_convex_session(
         
         return {
             "total_in_namespace": stats.get("total_vectors", 0),
-            "session_documents_count": len(results.get("ids", [[]])[0]),
+            "session_documents_count": len(results),
             "session_id": session_id,
             "documents": [
                 {
-                    "id": results["ids"][0][i],
-                    "document_name": results["metadatas"][0][i].get("document_name") if results.get("metadatas") else None,
-                    "page_number": results["metadatas"][0][i].get("page_number") if results.get("metadatas") else None,
-                    "text_preview": (results["documents"][0][i][:100] + "...") if results.get("documents") and results["documents"][0] and len(results["documents"][0][i]) > 100 else (results["documents"][0][i] if results.get("documents") and results["documents"][0] else None),
+                    "id": vec_id,
+                    "document_name": metadata.get("document_name"),
+                    "page_number": metadata.get("page_number"),
+                    "text_preview": (text[:100] + "...") if len(text) > 100 else text,
                 }
-                for i in range(len(results.get("ids", [[]])[0]))
+                for vec_id, metadata, text in zip(results.ids, results.metadatas, results.documents)
             ][:10]
         }
     except Exception as e:
@@ -147,38 +147,20 @@ async def warmup_backend() -> WarmupResponse:
     Models loaded:
     - bge-base-en-v1.5 (embeddings)
     - TinyBERT (reranking)
-    - KeyBERT backbone (keyword extraction)
+
+    Keyword extraction shares the embedding model.
     """
     start_time = time.time()
     models_loaded = []
     
     try:
-        # Pre-load embedding model
-        logger.info("[Warmup] Loading embedding model...")
-        from app.external.embeddings import get_local_embedding_service
-        embedding_service = get_local_embedding_service()
-        # Trigger model load by accessing the model property
-        _ = embedding_service.model
+        # Pre-load embedding, keyword and reranker models with one dummy inference each
+        logger.info("[Warmup] Loading RAG models...")
+        from app.services.rag import get_rag_service
+        await get_rag_service().warmup()
         models_loaded.append("bge-base-en-v1.5 (embeddings)")
-        logger.info("[Warmup] Embedding model loaded")
-        
-        # Pre-load reranker model
-        logger.info("[Warmup] Loading reranker model...")
-        from app.services.rag import RerankerService
-        reranker = RerankerService()
-        # Trigger model load
-        _ = reranker.model
         models_loaded.append("TinyBERT (reranking)")
-        logger.info("[Warmup] Reranker model loaded")
-        
-        # Pre-load KeyBERT model
-        logger.info("[Warmup] Loading KeyBERT model...")
-        from app.services.rag import KeywordExtractor
-        keyword_extractor = KeywordExtractor()
-        # Trigger model load
-        _ = keyword_extractor.model
-        models_loaded.append("all-MiniLM-L6-v2 (keywords)")
-        logger.info("[Warmup] KeyBERT model loaded")
+        logger.info("[Warmup] RAG models loaded")
         
         warmup_time = int((time.time() - start_time) * 1000)
         logger.info(f"[Warmup] All models loaded in {warmup_time}ms")
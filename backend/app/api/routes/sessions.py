@@ -6,7 +6,7 @@ This file only handles ML-related operations like note generation.
 
 from fastapi import APIRouter, BackgroundTasks
 
-from app.api.deps import NoteServiceDep
+from app.api.deps import NoteServiceDep, RAGServiceDep
 from app.schemas.session import (
     SessionEndRequest,
     SessionEndResponse,
@@ -30,12 +30,15 @@ async def end_session(
     data: SessionEndRequest,
     background_tasks: BackgroundTasks,
     note_service: NoteServiceDep,
+    rag_service: RAGServiceDep,
 ) -> SessionEndResponse:
     """End an active session and optionally trigger note generation.
     
     Note: Session state management is handled by Convex.
     This endpoint only triggers ML-related tasks like note generation.
     """
+    rag_service.invalidate_session(session_id)
+
     response = SessionEndResponse(
         status="completed",
         notes_generated=False,
@@ -3,17 +3,17 @@
 Uses Convex + Pinecone for all data storage (fully cloud-native).
 """
 
+import asyncio
 import json
 import logging
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel
 
-from app.api.deps import ConvexClientDep, RAGServiceDep
+from app.api.deps import ConvexClientDep
+from app.api.websocket import receive_messages, stop_receiving
 from app.external.convex import get_convex_client
-from app.external.pinecone import get_pinecone_client
-from app.external.embeddings import get_local_embedding_service
-from app.services.rag import RAGService, RerankerService, QueryEnrichmentService, KeywordExtractor
+from app.services.rag import get_rag_service
 
 logger = logging.getLogger(__name__)
 
@@ -32,27 +32,22 @@ class SegmentBuffer:
     def __init__(self):
         self.current_segment = None
         self.index = 0
+        # Derived once per segment in add(), so is_complete() is O(1)
+        self._has_content = False
 
     def add(self, segment_id: str, text: str) -> None:
         """Add a segment to the buffer."""
         self.current_segment = {"id": segment_id, "text": text}
+        self._has_content = not text.isspace() and len(text) > 0
 
     def is_complete(self) -> bool:
         """Check if there's a segment ready for RAG processing.
         
         Returns True if there's a segment with non-empty text.
         Each segment is processed individually for maximum flexibility.
+        The caller logs the trigger and reads the text once it dispatches.
         """
-        if self.current_segment is None:
-            return False
-        
-        text = self.get_text()
-        has_content = len(text.strip()) > 0
-        
-        if has_content:
-            logger.info(f"[SegmentBuffer] Triggering RAG for segment {self.index}: '{text[:50]}...'")
-        
-        return has_content
+        return self._has_content
 
     def get_text(self) -> str:
         """Get the current segment text."""
@@ -69,11 +64,17 @@ class SegmentBuffer:
     def advance(self) -> None:
         """Advance to next segment, clearing the current one."""
         self.current_segment = None
+        self._has_content = False
         self.index += 1
 
     def clear(self) -> None:
         """Clear the buffer."""
         self.current_segment = None
+        self._has_content = False
+
+
+# Most client messages handled (and transcripts saved) per batch
+MAX_MESSAGE_BATCH = 20
 
 
 @router.get("/sessions/{session_id}/transcript")
@@ -112,86 +113,139 @@ async def transcription_websocket(
     # Initialize segment buffer (processes each segment individually for RAG)
     segment_buffer = SegmentBuffer()
 
-    # Initialize services (no database needed)
+    # Shared services (no database needed; models are loaded once per process)
     convex_client = get_convex_client()
-    pinecone_client = get_pinecone_client()
-    embedding_service = get_local_embedding_service()
-    reranker = RerankerService()
-    keyword_extractor = KeywordExtractor()
-    query_enrichment = QueryEnrichmentService(keyword_extractor)
-
-    rag_service = RAGService(
-        pinecone_client,
-        embedding_service,
-        convex_client,
-        reranker,
-        query_enrichment,
-    )
+    rag_service = get_rag_service()
+
+    # Messages are read in the background so segments that arrive while a
+    # RAG query runs can be saved together
+    messages: asyncio.Queue = asyncio.Queue()
+    reader = asyncio.create_task(receive_messages(websocket, messages, "Transcription"))
 
     try:
-        while True:
-            message = await websocket.receive_text()
+        connected = True
+        while connected:
+            batch = [await messages.get()]
+            while len(batch) < MAX_MESSAGE_BATCH and not messages.empty():
+                batch.append(messages.get_nowait())
+            if None in batch:
+                connected = False
+                batch = batch[:batch.index(None)]
+
+            segments = []
+            for message in batch:
+                if message.get("text") is None:
+                    continue  # Binary frames carry nothing for transcription
+                try:
+                    data = json.loads(message["text"])
+                except json.JSONDecodeError:
+                    data = None
+                # Malformed messages are rejected one by one, so they can't fail
+                # the loop or the batch save for the valid segments around them
+                if not isinstance(data, dict):
+                    await websocket.send_json({
+                        "type": "error",
+                        "code": "INVALID_MESSAGE",
+                        "message": "Invalid JSON message",
+                    })
+                    continue
 
-            try:
-                data = json.loads(message)
                 msg_type = data.get("type")
-
                 if msg_type == "segment":
-                    segment_data = data.get("segment", {})
-                    frontend_id = segment_data.get("id")  # Capture frontend's segment ID
-                    
-                    text = segment_data.get("text", "")
-                    start_time = segment_data.get("start_time", 0)
-                    window_index = segment_data.get("window_index", segment_buffer.index)
-                    is_final = segment_data.get("is_final", True)
-
-                    # Save transcript to Convex
-                    try:
-                        transcript_id = await convex_client.add_transcript(
-                            session_id=session_id,
-                            original_text=text,
-                            timestamp=start_time,
-                            window_index=window_index,
-                            is_final=is_final,
-                        )
-                        
-                        logger.debug(f"[Transcribe] Saved transcript {transcript_id}")
-
-                        # Confirm save - include frontend_id for ID mapping
-                        await websocket.send_json({
-                            "type": "segment_saved",
-                            "segment_id": transcript_id,
-                            "frontend_id": frontend_id,
-                        })
-                    except Exception as save_error:
-                        logger.error(f"[Transcribe] Failed to save transcript: {save_error}")
+                    segment = data.get("segment", {})
+                    if not isinstance(segment, dict):
                         await websocket.send_json({
                             "type": "error",
-                            "code": "SAVE_ERROR",
-                            "message": f"Failed to save transcript: {save_error}",
+                            "code": "INVALID_MESSAGE",
+                            "message": "Segment must be a JSON object",
                         })
                         continue
+                    segments.append(segment)
+                elif msg_type == "ping":
+                    await websocket.send_json({"type": "pong"})
+
+            if not segments:
+                continue
+
+            try:
+                # Save all pending transcripts to Convex in one request. Segments
+                # without a window index get the one the buffer will assign them.
+                window_index = segment_buffer.index
+                transcripts = []
+                for segment_data in segments:
+                    text = segment_data.get("text", "")
+                    transcripts.append({
+                        "originalText": text,
+                        "timestamp": segment_data.get("start_time", 0),
+                        "windowIndex": segment_data.get("window_index", window_index),
+                        "isFinal": segment_data.get("is_final", True),
+                    })
+                    if text.strip():
+                        window_index += 1
+
+                try:
+                    transcript_ids = await convex_client.add_transcripts(
+                        session_id=session_id,
+                        transcripts=transcripts,
+                    )
+                    logger.debug("[Transcribe] Saved %d transcripts", len(transcript_ids))
+                except Exception as save_error:
+                    logger.error("[Transcribe] Failed to save transcripts: %s", save_error)
+                    await websocket.send_json({
+                        "type": "error",
+                        "code": "SAVE_ERROR",
+                        "message": f"Failed to save transcript: {save_error}",
+                    })
+                    continue
+
+            except Exception as e:
+                logger.error("Error processing segment: %s", e)
+                await websocket.send_json({
+                    "type": "error",
+                    "code": "PROCESSING_ERROR",
+                    "message": str(e),
+                })
+                continue
+
+            # Each saved segment is confirmed and queried on its own, so an error on
+            # one doesn't drop the ID mapping and citations for the rest
+            for segment_data, transcript_id in zip(segments, transcript_ids):
+                try:
+                    frontend_id = segment_data.get("id")  # Capture frontend's segment ID
+                    text = segment_data.get("text", "")
+
+                    # Confirm save - include frontend_id for ID mapping
+                    await websocket.send_json({
+                        "type": "segment_saved",
+                        "segment_id": transcript_id,
+                        "frontend_id": frontend_id,
+                    })
 
                     # Add segment to buffer for RAG processing
                     segment_buffer.add(transcript_id, text)
-                    logger.debug(f"[Transcribe] Processing segment: '{segment_buffer.get_text()[:50]}...'")
+                    logger.debug("[Transcribe] Processing segment: '%.50s...'", text)
 
                     # Each segment triggers RAG individually
                     if segment_buffer.is_complete():
-                        logger.info(f"[Transcribe] Triggering RAG for segment {segment_buffer.index}")
                         segment_text = segment_buffer.get_text()
-                        
+                        logger.info(
+                            "[Transcribe] Triggering RAG for segment %d: '%.50s...'",
+                            segment_buffer.index,
+                            segment_text,
+                        )
+
                         try:
                             rag_result = await rag_service.query(
                                 session_id=session_id,
                                 transcript_text=segment_text,
                                 window_index=segment_buffer.index,
                                 transcript_id=transcript_id,
+                                include_keywords=False,  # Not sent to the client
                             )
 
                             # Send citations to client
                             if rag_result.citations:
-                                logger.info(f"[Transcribe] Sending {len(rag_result.citations)} citations to client")
+                                logger.info("[Transcribe] Sending %d citations to client", len(rag_result.citations))
                                 await websocket.send_json({
                                     "type": "citations",
                                     "window_index": rag_result.window_index,
@@ -209,31 +263,24 @@ async def transcription_websocket(
                                     ],
                                 })
                             else:
-                                logger.info(f"[Transcribe] No citations found for segment {segment_buffer.index}")
+                                logger.info("[Transcribe] No citations found for segment %d", segment_buffer.index)
                         except Exception as rag_error:
-                            logger.error(f"[Transcribe] RAG query failed: {rag_error}")
+                            logger.error("[Transcribe] RAG query failed: %s", rag_error)
 
                         # Advance to next segment
                         segment_buffer.advance()
-
-                elif msg_type == "ping":
-                    await websocket.send_json({"type": "pong"})
-
-            except json.JSONDecodeError:
-                await websocket.send_json({
-                    "type": "error",
-                    "code": "INVALID_MESSAGE",
-                    "message": "Invalid JSON message",
-                })
-            except Exception as e:
-                logger.error(f"Error processing segment: {e}")
-                await websocket.send_json({
-                    "type": "error",
-                    "code": "PROCESSING_ERROR",
-                    "message": str(e),
-                })
-
+                except Exception as e:
+                    logger.error("Error processing segment: %s", e)
+                    await websocket.send_json({
+                        "type": "error",
+                        "code": "PROCESSING_ERROR",
+                        "message": str(e),
+                    })
+
+        logger.info("Transcription WebSocket disconnected for session %s", session_id)
     except WebSocketDisconnect:
-        logger.info(f"Transcription WebSocket disconnected for session {session_id}")
+        logger.info("Transcription WebSocket disconnected for session %s", session_id)
     except Exception as e:
-        logger.error(f"Transcription WebSocket error: {e}")
+        logger.error("Transcription WebSocket error: %s", e)
+    finally:
+        await stop_receiving(reader)
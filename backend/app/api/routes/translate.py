@@ -3,19 +3,21 @@
 import asyncio
 import json
 import logging
+from collections import deque
 from uuid import UUID
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
-from fastapi.responses import Response
+from fastapi.responses import StreamingResponse
 
 from app.api.deps import (
     QuestionTranslationServiceDep,
     TranslationServiceDep,
     TTSServiceDep,
 )
+from app.api.websocket import receive_messages, stop_receiving
 from app.core.config import settings
 from app.external.elevenlabs import get_elevenlabs_client
-from app.external.openrouter import get_openrouter_client
+from app.external.openrouter import BatchTranslationMismatchError, get_openrouter_client
 from app.schemas.translation import (
     LanguageInfo,
     LanguagesResponse,
@@ -182,11 +184,11 @@ async def translate_question(
 async def text_to_speech(
     data: TTSSpeakRequest,
     service: TTSServiceDep,
-) -> Response:
-    """Convert text to speech and return audio."""
-    audio_bytes = await service.speak(data.text, voice_id=data.voice_id)
-    return Response(
-        content=audio_bytes,
+) -> StreamingResponse:
+    """Convert text to speech and stream the audio as it is synthesized."""
+    audio_stream = await service.stream_speech(data.text, voice_id=data.voice_id)
+    return StreamingResponse(
+        audio_stream,
         media_type="audio/mpeg",
         headers={
             "Content-Disposition": "inline",
@@ -194,6 +196,26 @@ async def text_to_speech(
     )
 
 
+# Queued translate requests are combined up to this many characters
+TRANSLATION_BATCH_MAX_CHARS = 1000
+
+
+def _translate_request(message: dict | None) -> tuple[str, str | None] | None:
+    """Return (text, segment_id) if the message is a non-empty translate request."""
+    if not message or not message.get("text"):
+        return None
+    try:
+        data = json.loads(message["text"])
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(data, dict) or data.get("type") != "translate":
+        return None
+    text = data.get("text", "").strip()
+    if not text:
+        return None
+    return text, data.get("segment_id")
+
+
 @router.websocket("/stream")
 async def translation_websocket(
     websocket: WebSocket,
@@ -221,7 +243,7 @@ async def translation_websocket(
         Server → Client: JSON status messages
     """
     # Validate language
-    if target_language not in settings.supported_languages:
+    if target_language not in settings.supported_language_codes:
         await websocket.close(code=4001, reason="Invalid language")
         return
 
@@ -237,22 +259,37 @@ async def translation_websocket(
     current_voice_id = voice_id
     processing_lock = asyncio.Lock()
 
-    async def translate_and_speak(text: str, lang: str) -> tuple[str | None, bytes | None]:
-        """Translate text and convert to speech.
+    async def translate_and_speak(
+        texts: list[str], lang: str
+    ) -> tuple[list[str] | None, bytes | None]:
+        """Translate text segments and convert them to speech as one clip.
         
         Returns:
-            Tuple of (translated_text, audio_bytes)
+            Tuple of (translated_texts, audio_bytes)
         """
         try:
-            # Step 1: Translate English text to target language
-            translated_text = await openrouter_client.translate_to_language(text, lang)
-            logger.info(f"Translated '{text[:50]}...' to {lang}: '{translated_text[:50]}...'")
+            # Step 1: Translate English text to target language, all queued
+            # segments in a single LLM request
+            if len(texts) == 1:
+                translated_texts = [await openrouter_client.translate_to_language(texts[0], lang)]
+            else:
+                try:
+                    translated_texts = await openrouter_client.translate_batch_to_language(texts, lang)
+                except BatchTranslationMismatchError:
+                    # The model didn't return one translation per segment. Request
+                    # failures (rate limits, timeouts) aren't retried per segment.
+                    translated_texts = list(await asyncio.gather(*(
+                        openrouter_client.translate_to_language(text, lang) for text in texts
+                    )))
+            logger.info("Translated %d segment(s) '%.50s...' to %s", len(texts), texts[0], lang)
             
             # Step 2: Convert translated text to speech using ElevenLabs TTS
-            audio_bytes = await elevenlabs_client.text_to_speech(translated_text, voice_id=current_voice_id)
-            return translated_text, audio_bytes
+            audio_bytes = await elevenlabs_client.text_to_speech(
+                " ".join(translated_texts), voice_id=current_voice_id
+            )
+            return translated_texts, audio_bytes
         except Exception as e:
-            logger.error(f"Translation pipeline failed: {e}")
+            logger.error("Translation pipeline failed: %s", e)
             return None, None
 
     # Send connected message
@@ -262,9 +299,18 @@ async def translation_websocket(
         "language": target_language,
     })
 
+    # Messages are read in the background so segments that queue up during a
+    # translation can be folded into the next one
+    messages: asyncio.Queue = asyncio.Queue()
+    reader = asyncio.create_task(receive_messages(websocket, messages, "Translation"))
+    backlog: deque = deque()
+
     try:
         while True:
-            message = await websocket.receive()
+            message = backlog.popleft() if backlog else await messages.get()
+            if message is None:
+                logger.info("Translation WebSocket disconnected for session %s", session_id)
+                break
 
             if "bytes" in message:
                 # Legacy: ignore raw audio chunks (we now use text-based translation)
@@ -280,18 +326,34 @@ async def translation_websocket(
                         text = data.get("text", "").strip()
                         segment_id = data.get("segment_id")  # Optional segment ID for UI updates
                         if text and not is_muted:
+                            # Fold in translate requests already waiting behind this one
+                            segments = [(text, segment_id)]
+                            batch_chars = len(text)
+                            while not messages.empty():
+                                backlog.append(messages.get_nowait())
+                            while backlog:
+                                queued = _translate_request(backlog[0])
+                                if queued is None or batch_chars + len(queued[0]) > TRANSLATION_BATCH_MAX_CHARS:
+                                    break
+                                backlog.popleft()
+                                segments.append(queued)
+                                batch_chars += len(queued[0])
+
                             # Process translation
                             async with processing_lock:
-                                translated_text, audio_bytes = await translate_and_speak(text, current_language)
-                                if translated_text:
+                                translated_texts, audio_bytes = await translate_and_speak(
+                                    [original for original, _ in segments], current_language
+                                )
+                                if translated_texts:
                                     # Send translated text first for immediate UI update
                                     # Note: Frontend saves to database via REST API after receiving backend ID
-                                    await websocket.send_json({
-                                        "type": "translated_text",
-                                        "original_text": text,
-                                        "translated_text": translated_text,
-                                        "segment_id": segment_id,
-                                    })
+                                    for (original, original_id), translated_text in zip(segments, translated_texts):
+                                        await websocket.send_json({
+                                            "type": "translated_text",
+                                            "original_text": original,
+                                            "translated_text": translated_text,
+                                            "segment_id": original_id,
+                                        })
                                 if audio_bytes:
                                     # Then send audio
                                     await websocket.send_bytes(audio_bytes)
@@ -312,7 +374,7 @@ async def translation_websocket(
 
                     elif msg_type == "change_language":
                         new_lang = data.get("language")
-                        if new_lang in settings.supported_languages:
+                        if new_lang in settings.supported_language_codes:
                             current_language = new_lang
                             await websocket.send_json({
                                 "type": "language_changed",
@@ -336,10 +398,12 @@ async def translation_websocket(
                     })
 
     except WebSocketDisconnect:
-        logger.info(f"Translation WebSocket disconnected for session {session_id}")
+        logger.info("Translation WebSocket disconnected for session %s", session_id)
     except Exception as e:
-        logger.error(f"Translation WebSocket error: {e}")
+        logger.error("Translation WebSocket error: %s", e)
         try:
             await websocket.close(code=4000, reason=str(e))
         except Exception:
             pass
+    finally:
+        await stop_receiving(reader)
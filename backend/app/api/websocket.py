@@ -0,0 +1,39 @@
+"""Shared helpers for WebSocket routes."""
+
+import asyncio
+import logging
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+logger = logging.getLogger(__name__)
+
+
+async def receive_messages(websocket: WebSocket, queue: asyncio.Queue, name: str) -> None:
+    """Forward client messages to a queue; None marks the end of the stream.
+
+    Messages are queued as received (dicts with "text" or "bytes"), so a route
+    can handle ones that arrived while it was busy together.
+
+    Args:
+        websocket: Accepted WebSocket connection
+        queue: Queue the route reads messages from
+        name: Route name used in log messages
+    """
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            queue.put_nowait(message)
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error("%s WebSocket receive failed: %s", name, e)
+    finally:
+        queue.put_nowait(None)
+
+
+async def stop_receiving(reader: asyncio.Task) -> None:
+    """Cancel a receive_messages task and wait for it to finish."""
+    reader.cancel()
+    await asyncio.gather(reader, return_exceptions=True)
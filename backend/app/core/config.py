@@ -4,11 +4,25 @@ Uses Convex + Pinecone for all data storage (fully cloud-native).
 """
 
 from functools import lru_cache
-from typing import List
+from types import MappingProxyType
+from typing import List, Mapping
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Built once at import; read-only so callers can't mutate the shared mapping
+SUPPORTED_LANGUAGES: Mapping[str, str] = MappingProxyType(
+    {
+        "en": "English",
+        "hi": "Hindi",
+        "zh": "Chinese (Mandarin)",
+        "fr": "French",
+        "es": "Spanish",
+        "bn": "Bengali",
+    }
+)
+SUPPORTED_LANGUAGE_CODES: frozenset[str] = frozenset(SUPPORTED_LANGUAGES)
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -55,6 +69,7 @@ class Settings(BaseSettings):
     # ===========================================
     pinecone_api_key: str = Field(default="")
     pinecone_index_name: str = Field(default="rosetta-documents")
+    pinecone_use_grpc: bool = Field(default=True)  # Needs pinecone[grpc], falls back to REST
 
     # ===========================================
     # Convex Configuration (Primary Database)
@@ -74,18 +89,37 @@ class Settings(BaseSettings):
     # ===========================================
     # Local embedding model for both indexing and RAG queries (must match!)
     local_embedding_model: str = Field(default="BAAI/bge-base-en-v1.5")
+    embedding_use_onnx: bool = Field(default=True)  # INT8 ONNX Runtime, false forces FP32 PyTorch
     
     # Cross-encoder for re-ranking (TinyBERT for speed)
     reranker_model: str = Field(default="cross-encoder/ms-marco-TinyBERT-L-2-v2")
-    
-    # KeyBERT backbone for keyword extraction
-    keybert_model: str = Field(default="sentence-transformers/all-MiniLM-L6-v2")
-    
+    reranker_use_onnx: bool = Field(default=True)  # INT8 ONNX Runtime, falls back to PyTorch
+
+    # Static [rag_top_k_candidates, 256] reranker inputs; pads every batch to that shape
+    reranker_static_shape: bool = Field(default=False)
+
+    # Cache directory for ONNX exports (built on first model load)
+    onnx_model_dir: str = Field(default="./models/onnx")
+    onnx_use_openvino: bool = Field(default=False)  # Needs onnxruntime-openvino
+
+    # BF16 PyTorch inference (needs AVX-512 BF16/AMX); kept only if it matches FP32
+    torch_bfloat16: bool = Field(default=False)
+
     # RAG pipeline settings
     rag_top_k_candidates: int = Field(default=5)  # Candidates for re-ranking
     rag_top_k_results: int = Field(default=3)  # Final results to return
     rag_relevance_threshold: float = Field(default=0.4)  # Minimum re-ranker score
     rag_distance_threshold: float = Field(default=1.5)  # Max L2 distance for early exit
+    rag_strong_match_distance: float = Field(default=0.15)  # Skip reranking below this distance...
+    rag_strong_match_gap: float = Field(default=0.1)  # ...when this far ahead of the runner-up
+    rag_rerank_max_chars: int = Field(default=800)  # Candidate text scored by reranker (~200 tokens)
+    rag_enrichment_max_words: int = Field(default=40)  # Skip keyword extraction above this
+    rag_warmup_on_startup: bool = Field(default=True)  # Load RAG models in app lifespan
+    rag_cpu_workers: int = Field(default=0)  # CPU inference threads, 0 = one per core
+    torch_threads: int = Field(default=0)  # Threads per inference call, 0 = cores / workers
+    rag_keyword_cache_size: int = Field(default=256)  # Keyword results cached by text hash
+    rag_query_cache_size: int = Field(default=512)  # Pinecone candidates cached per session
+    rag_query_cache_ttl_seconds: int = Field(default=300)  # Bounds staleness after uploads
     
     # LLM models (used for translation, note generation)
     llm_model: str = Field(default="anthropic/claude-3-haiku-20240307")
@@ -96,6 +130,8 @@ class Settings(BaseSettings):
     # ===========================================
     elevenlabs_voice_id: str = Field(default="21m00Tcm4TlvDq8ikWAM")
     elevenlabs_model_id: str = Field(default="eleven_turbo_v2_5")
+    tts_cache_size: int = Field(default=256)  # Synthesized clips kept for repeated phrases
+    tts_cache_max_chars: int = Field(default=200)  # Only cache texts up to this length
 
     # ===========================================
     # File Storage (for temp files during processing)
@@ -112,21 +148,23 @@ class Settings(BaseSettings):
     # Supported Languages
     # ===========================================
     @property
-    def supported_languages(self) -> dict[str, str]:
+    def supported_languages(self) -> Mapping[str, str]:
         """Return supported language codes and names."""
-        return {
-            "en": "English",
-            "hi": "Hindi",
-            "zh": "Chinese (Mandarin)",
-            "fr": "French",
-            "es": "Spanish",
-            "bn": "Bengali",
-        }
+        return SUPPORTED_LANGUAGES
 
+    @property
+    def supported_language_codes(self) -> frozenset[str]:
+        """Return supported language codes for membership checks."""
+        return SUPPORTED_LANGUAGE_CODES
 
-@lru_cache
+
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get cached settings instance."""
+    """Get cached settings instance.
+
+    The environment and .env file are parsed once per process; derived values
+    such as SUPPORTED_LANGUAGE_CODES are built at import time.
+    """
     return Settings()
 
 
@@ -0,0 +1,69 @@
+"""CPU thread budgeting for local model inference.
+
+RAG queries for concurrent sessions run on a pool of worker threads, and each
+inference call gets a fixed share of the cores. The trade-off:
+
+- One RAG worker: each call may use every core (lowest single-query latency).
+- Many RAG workers: one thread per call, so parallel sessions don't fight over
+  cores with competing OpenMP/MKL pools (stable p99 under load).
+
+Thread counts are pinned rather than left to MKL's dynamic adjustment, which
+spikes latency when concurrent calls contend for cores.
+"""
+
+import logging
+import os
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def cpu_core_count() -> int:
+    """Number of CPU cores available to this process."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def rag_cpu_workers() -> int:
+    """Number of worker threads for CPU-bound RAG stages."""
+    return settings.rag_cpu_workers or cpu_core_count()
+
+
+def intra_op_threads() -> int:
+    """Threads each inference call may use.
+
+    TORCH_THREADS if set, otherwise the cores split evenly across RAG workers.
+    """
+    if settings.torch_threads:
+        return settings.torch_threads
+    return max(1, cpu_core_count() // rag_cpu_workers())
+
+
+def configure_thread_env() -> None:
+    """Pin OpenMP/MKL thread pools before torch or onnxruntime are imported.
+
+    Explicit environment values take precedence.
+    """
+    threads = str(intra_op_threads())
+    os.environ.setdefault("OMP_NUM_THREADS", threads)
+    os.environ.setdefault("MKL_NUM_THREADS", threads)
+    os.environ.setdefault("MKL_DYNAMIC", "FALSE")
+
+
+def configure_torch_threads() -> None:
+    """Pin PyTorch intra-op threads and disable inter-op parallelism.
+
+    Must run before torch executes any parallel work, since the inter-op pool
+    can only be sized once.
+    """
+    import torch
+
+    threads = intra_op_threads()
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError as e:
+        logger.warning(f"Could not set torch inter-op threads: {e}")
+    logger.info(f"Torch using {threads} intra-op thread(s) per RAG worker")
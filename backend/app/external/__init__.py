@@ -1,11 +1,12 @@
 """External API clients."""
 
-from app.external.pinecone import PineconeClient, get_pinecone_client
+from app.external.pinecone import PineconeClient, PineconeHits, get_pinecone_client
 from app.external.elevenlabs import ElevenLabsClient, get_elevenlabs_client
 from app.external.openrouter import OpenRouterClient, get_openrouter_client
 
 __all__ = [
     "PineconeClient",
+    "PineconeHits",
     "get_pinecone_client",
     "ElevenLabsClient",
     "get_elevenlabs_client",
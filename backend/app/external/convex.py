@@ -28,7 +28,12 @@ class ConvexClient:
             base_url: Convex HTTP endpoint URL. Defaults to settings.convex_http_url.
         """
         self.base_url = base_url or settings.convex_http_url
-        self._client = httpx.AsyncClient(timeout=30.0)
+        # One pooled HTTP/2 client per process, so calls reuse warm connections
+        self._client = httpx.AsyncClient(
+            timeout=30.0,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+        )
         logger.info(f"[ConvexClient] Initialized with URL: {self.base_url}")
 
     async def close(self):
@@ -98,6 +103,33 @@ class ConvexClient:
         logger.debug(f"[ConvexClient] Added transcript: {transcript_id}")
         return transcript_id
 
+    async def add_transcripts(
+        self,
+        session_id: str,
+        transcripts: list[dict],
+    ) -> list[str]:
+        """Add a batch of transcript segments to Convex in one request.
+        
+        Args:
+            session_id: Convex session ID
+            transcripts: List of transcript dicts with:
+                - originalText: Original transcript text
+                - timestamp: Timestamp in seconds
+                - windowIndex: Window/segment index
+                - isFinal: Whether this is a final transcript
+                - translatedText: Optional translated text
+                
+        Returns:
+            List of created transcript IDs, in input order
+        """
+        result = await self._post("/api/transcripts/batch", {
+            "sessionId": session_id,
+            "transcripts": transcripts,
+        })
+        transcript_ids = result.get("transcriptIds", [])
+        logger.debug(f"[ConvexClient] Added {len(transcript_ids)} transcripts")
+        return transcript_ids
+
     async def get_full_transcript(self, session_id: str) -> dict:
         """Get full transcript text for a session.
         
@@ -112,6 +144,20 @@ class ConvexClient:
         })
         return result
 
+    async def get_note_context(self, session_id: str) -> dict:
+        """Get transcript text and citations for a session in one request.
+        
+        Args:
+            session_id: Convex session ID
+            
+        Returns:
+            Dict with originalText, translatedText and citations (with document info)
+        """
+        result = await self._post("/api/sessions/note-context", {
+            "sessionId": session_id,
+        })
+        return result
+
     # =========================================================================
     # CITATION OPERATIONS
     # =========================================================================
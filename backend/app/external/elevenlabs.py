@@ -2,7 +2,7 @@
 
 import asyncio
 import logging
-from typing import AsyncGenerator, Optional
+from typing import AsyncGenerator, Optional, Union
 
 import httpx
 import websockets
@@ -12,6 +12,9 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Audio frames may be any bytes-like buffer; they are forwarded without copying
+AudioBuffer = Union[bytes, bytearray, memoryview]
+
 
 class ElevenLabsClient:
     """Client for ElevenLabs Speech-to-Speech and TTS APIs."""
@@ -103,6 +106,52 @@ class ElevenLabsClient:
             logger.error(f"TTS request failed: {e}")
             raise
 
+    async def text_to_speech_stream(
+        self,
+        text: str,
+        voice_id: Optional[str] = None,
+        model_id: Optional[str] = None,
+    ) -> AsyncGenerator[bytes, None]:
+        """Convert text to speech, yielding MP3 chunks as they are synthesized.
+
+        Args:
+            text: The text to convert to speech
+            voice_id: ElevenLabs voice ID (default from settings)
+            model_id: ElevenLabs model ID (default from settings)
+
+        Yields:
+            Audio chunks in MP3 format
+        """
+        voice_id = voice_id or settings.elevenlabs_voice_id
+        model_id = model_id or settings.elevenlabs_model_id
+
+        try:
+            async with self.http_client.stream(
+                "POST",
+                f"/text-to-speech/{voice_id}/stream",
+                json={
+                    "text": text,
+                    "model_id": model_id,
+                    "voice_settings": {
+                        "stability": 0.5,
+                        "similarity_boost": 0.75,
+                    },
+                },
+                headers={
+                    "Accept": "audio/mpeg",
+                    "Content-Type": "application/json",
+                },
+            ) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes():
+                    yield chunk
+        except httpx.HTTPStatusError as e:
+            logger.error(f"TTS stream failed with status {e.response.status_code}: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"TTS stream failed: {e}")
+            raise
+
     async def create_s2s_websocket(
         self,
         target_language: str,
@@ -156,8 +205,13 @@ class ElevenLabsS2SStream:
         self.target_language = target_language
         self._closed = False
 
-    async def send_audio(self, audio_chunk: bytes) -> None:
-        """Send audio chunk to ElevenLabs."""
+    async def send_audio(self, audio_chunk: AudioBuffer) -> None:
+        """Send audio chunk to ElevenLabs.
+
+        The websockets library frames any bytes-like object as binary, so
+        bytearray and memoryview chunks are sent as-is instead of being
+        copied into a new bytes object.
+        """
         if not self._closed:
             await self.websocket.send(audio_chunk)
 
@@ -1,56 +1,207 @@
-"""Local embedding service using sentence-transformers."""
+"""Local embedding service using ONNX Runtime or sentence-transformers."""
 
+import copy
 import logging
+import threading
 from typing import List, Optional
 
+import numpy as np
 from sentence_transformers import SentenceTransformer
 
 from app.core.config import settings
+from app.external.onnx_runtime import (
+    QUANTIZED_MODEL_FILE,
+    create_cpu_session,
+    export_quantized_model,
+)
 
 logger = logging.getLogger(__name__)
 
+# Probe texts for validating reduced-precision inference against FP32
+PARITY_PROBES = [
+    "The mitochondria is the powerhouse of the cell.",
+    "Bangladesh declared independence from Pakistan in 1971.",
+    "A binary search tree keeps its keys in sorted order.",
+    "Supply and demand determine the market price of a good.",
+]
+MIN_PARITY_COSINE = 0.999
+MAX_SCORE_DRIFT = 1e-2
+
+
+def matches_fp32(reference: np.ndarray, candidate: np.ndarray) -> bool:
+    """Check reduced-precision embeddings against FP32 embeddings by cosine similarity.
+
+    Args:
+        reference: FP32 embeddings, one row per probe
+        candidate: Reduced-precision embeddings of the same shape
+
+    Returns:
+        True if every row has cosine similarity above MIN_PARITY_COSINE
+    """
+    reference = np.atleast_2d(reference).astype(np.float32)
+    candidate = np.atleast_2d(candidate).astype(np.float32)
+    norms = np.linalg.norm(reference, axis=1) * np.linalg.norm(candidate, axis=1)
+    cosine = (reference * candidate).sum(axis=1) / np.maximum(norms, 1e-12)
+    return bool(cosine.min() > MIN_PARITY_COSINE)
+
+
+def scores_match_fp32(reference: np.ndarray, candidate: np.ndarray) -> bool:
+    """Check reduced-precision relevance scores against FP32 scores.
+
+    Cosine similarity barely reacts to a uniform shift of positive scores, which is
+    exactly what moves results across the relevance threshold, so scores are
+    compared element-wise and must also rank the pairs in the same order.
+
+    Args:
+        reference: FP32 scores, one per pair
+        candidate: Reduced-precision scores for the same pairs
+
+    Returns:
+        True if no score moves by MAX_SCORE_DRIFT or more and the ranking is unchanged
+    """
+    reference = np.asarray(reference, dtype=np.float32).ravel()
+    candidate = np.asarray(candidate, dtype=np.float32).ravel()
+    if np.abs(reference - candidate).max() >= MAX_SCORE_DRIFT:
+        return False
+    return bool(np.array_equal(np.argsort(-reference), np.argsort(-candidate)))
+
 
 class LocalEmbeddingService:
     """Service for generating embeddings locally using sentence-transformers.
     
     Uses BAAI/bge-base-en-v1.5 for high-quality 768-dimensional embeddings.
     This model achieves ~98% of OpenAI embedding quality with ~10ms local inference.
+    Runs as an INT8-quantized ONNX Runtime session when available, with the
+    PyTorch SentenceTransformer as fallback.
     """
 
+    # bge models are trained with 512-token inputs
+    MAX_SEQ_LENGTH = 512
+    BATCH_SIZE = 32
+
     def __init__(self, model_name: Optional[str] = None):
         self.model_name = model_name or settings.local_embedding_model
         self._model: Optional[SentenceTransformer] = None
+        self._session = None
+        self._tokenizer = None
+        self._input_names: List[str] = []
+        self._onnx_loaded = False
+        # Models load lazily from RAG pool threads; one thread loads, the rest wait
+        self._load_lock = threading.Lock()
         logger.info(f"LocalEmbeddingService configured with model: {self.model_name}")
 
+    @property
+    def session(self):
+        """Lazy load the INT8-quantized ONNX session, or None if disabled or unavailable."""
+        if not self._onnx_loaded:
+            with self._load_lock:
+                if not self._onnx_loaded:
+                    if settings.embedding_use_onnx:
+                        self._load_onnx_session()
+                    # Set only once loading finished, so no caller falls back to PyTorch mid-load
+                    self._onnx_loaded = True
+        return self._session
+
+    def _load_onnx_session(self) -> None:
+        """Load the INT8-quantized ONNX export of the embedding model."""
+        try:
+            from transformers import AutoTokenizer
+            logger.info(f"Loading ONNX embedding model: {self.model_name}")
+            model_dir = export_quantized_model(
+                self.model_name, task="feature-extraction", per_channel=True
+            )
+            self._tokenizer = AutoTokenizer.from_pretrained(model_dir)
+            self._session = create_cpu_session(model_dir / QUANTIZED_MODEL_FILE)
+            self._input_names = [i.name for i in self._session.get_inputs()]
+            logger.info(f"ONNX embedding model loaded: {self.model_name}")
+        except Exception as e:
+            logger.warning(f"ONNX embedding model unavailable, using PyTorch: {e}")
+            self._session = None
+
     @property
     def model(self) -> SentenceTransformer:
         """Lazy load the embedding model."""
         if self._model is None:
-            logger.info(f"Loading embedding model: {self.model_name}")
-            self._model = SentenceTransformer(self.model_name)
-            logger.info(f"Loaded embedding model with dimension: {self._model.get_sentence_embedding_dimension()}")
+            with self._load_lock:
+                if self._model is None:
+                    logger.info(f"Loading embedding model: {self.model_name}")
+                    model = SentenceTransformer(self.model_name)
+                    if settings.torch_bfloat16:
+                        model = self._to_bfloat16(model)
+                    logger.info(f"Loaded embedding model with dimension: {model.get_sentence_embedding_dimension()}")
+                    self._model = model
         return self._model
 
+    def _to_bfloat16(self, model: SentenceTransformer) -> SentenceTransformer:
+        """Cast the model to BF16, keeping FP32 if embeddings drift from FP32."""
+        import torch
+
+        bf16_model = copy.deepcopy(model).to(dtype=torch.bfloat16)
+        reference = model.encode(PARITY_PROBES, normalize_embeddings=True)
+        candidate = bf16_model.encode(PARITY_PROBES, normalize_embeddings=True)
+        if not matches_fp32(reference, candidate):
+            logger.warning("BF16 embeddings diverge from FP32, keeping FP32 model")
+            return model
+
+        logger.info("Embedding model running in BF16")
+        return bf16_model
+
     @property
     def embedding_dimension(self) -> int:
         """Get the embedding dimension for the model."""
+        if self.session is not None:
+            return self.session.get_outputs()[0].shape[-1]
         return self.model.get_sentence_embedding_dimension()
 
-    def create_embedding(self, text: str) -> List[float]:
-        """Create an embedding for a single text.
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts into a 2D array of L2-normalized embeddings.
 
         Args:
-            text: Text to embed
+            texts: List of texts to embed
 
         Returns:
-            Embedding vector as list of floats
+            Array of shape (len(texts), embedding_dimension)
         """
-        embedding = self.model.encode(
-            text,
+        if self.session is not None:
+            return self._encode_onnx(texts)
+
+        return self.model.encode(
+            texts,
             normalize_embeddings=True,
             show_progress_bar=False,
+            batch_size=self.BATCH_SIZE,
+            convert_to_numpy=True,
         )
-        return embedding.tolist()
+
+    def _encode_onnx(self, texts: List[str]) -> np.ndarray:
+        """Encode texts with the ONNX session using bge's CLS pooling."""
+        batches = []
+        for start in range(0, len(texts), self.BATCH_SIZE):
+            encoded = self._tokenizer(
+                texts[start:start + self.BATCH_SIZE],
+                padding="longest",
+                truncation=True,
+                max_length=self.MAX_SEQ_LENGTH,
+                return_tensors="np",
+            )
+            inputs = {name: encoded[name].astype(np.int64) for name in self._input_names}
+            last_hidden_state = self._session.run(None, inputs)[0]
+            batches.append(last_hidden_state[:, 0])
+
+        embeddings = np.concatenate(batches).astype(np.float32, copy=False)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-12)
+
+    def create_embedding(self, text: str) -> np.ndarray:
+        """Create an embedding for a single text.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Contiguous float32 embedding vector
+        """
+        return np.ascontiguousarray(self.encode([text])[0], dtype=np.float32)
 
     def create_embeddings(self, texts: List[str]) -> List[List[float]]:
         """Create embeddings for multiple texts.
@@ -64,13 +215,7 @@ class LocalEmbeddingService:
         if not texts:
             return []
             
-        embeddings = self.model.encode(
-            texts,
-            normalize_embeddings=True,
-            show_progress_bar=False,
-            batch_size=32,
-        )
-        return embeddings.tolist()
+        return self.encode(texts).tolist()
 
 
 # Singleton instance
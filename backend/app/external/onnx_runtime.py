@@ -0,0 +1,118 @@
+"""ONNX Runtime helpers for local transformer inference.
+
+Exports Hugging Face models to ONNX with optimum and applies dynamic INT8
+quantization, so CPU inference runs on int8 GEMMs (AVX-512 VNNI) instead of
+FP32 PyTorch. Exports are cached on disk and only built on first load.
+"""
+
+import logging
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.cpu import intra_op_threads
+
+logger = logging.getLogger(__name__)
+
+QUANTIZED_MODEL_FILE = "model_quantized.onnx"
+
+
+def export_quantized_model(model_name: str, task: str, per_channel: bool = False) -> Path:
+    """Export a model to ONNX and quantize its weights to INT8.
+
+    Args:
+        model_name: Hugging Face model ID
+        task: "text-classification" (cross-encoders) or "feature-extraction" (embedders)
+        per_channel: Quantize each output channel with its own scale (more accurate,
+            used where outputs are compared against stored vectors)
+
+    Returns:
+        Directory containing the quantized model and its tokenizer
+    """
+    model_dir = Path(settings.onnx_model_dir) / model_name.replace("/", "--")
+    if (model_dir / QUANTIZED_MODEL_FILE).exists():
+        return model_dir
+
+    from optimum.onnxruntime import (
+        ORTModelForFeatureExtraction,
+        ORTModelForSequenceClassification,
+        ORTQuantizer,
+    )
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+
+    model_classes = {
+        "text-classification": ORTModelForSequenceClassification,
+        "feature-extraction": ORTModelForFeatureExtraction,
+    }
+
+    logger.info(f"[ONNX] Exporting {model_name} to {model_dir}")
+    ort_model = model_classes[task].from_pretrained(model_name, export=True)
+
+    # Dynamic quantization: weights are INT8, activations are quantized at runtime
+    quantizer = ORTQuantizer.from_pretrained(ort_model)
+    quantization_config = AutoQuantizationConfig.avx512_vnni(
+        is_static=False, per_channel=per_channel
+    )
+    quantizer.quantize(save_dir=model_dir, quantization_config=quantization_config)
+
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(model_dir)
+    logger.info(f"[ONNX] Quantized {model_name} to INT8")
+    return model_dir
+
+
+def fix_input_shapes(model_path: Path, batch_size: int, sequence_length: int) -> Path:
+    """Write a copy of an exported model with static batch and sequence dimensions.
+
+    Static shapes let graph optimizers specialize kernels instead of handling
+    arbitrary input sizes. Callers must pad inputs to exactly these dimensions.
+
+    Returns:
+        Path of the static-shape model (cached next to the original)
+    """
+    static_path = model_path.with_name(
+        f"{model_path.stem}_static_{batch_size}x{sequence_length}.onnx"
+    )
+    if static_path.exists():
+        return static_path
+
+    import onnx
+    from onnxruntime.tools.onnx_model_utils import fix_output_shapes, make_dim_param_fixed
+
+    model = onnx.load(str(model_path))
+    # Dimension names used by optimum's transformer exports
+    make_dim_param_fixed(model.graph, "batch_size", batch_size)
+    make_dim_param_fixed(model.graph, "sequence_length", sequence_length)
+    fix_output_shapes(model)
+    onnx.save(model, str(static_path))
+    logger.info(f"[ONNX] Fixed {model_path.name} to input shape [{batch_size}, {sequence_length}]")
+    return static_path
+
+
+def create_cpu_session(model_path: Path):
+    """Create an ONNX Runtime inference session on the CPU.
+
+    Uses the OpenVINO execution provider when enabled and installed, with the
+    default CPU provider handling any nodes OpenVINO doesn't support.
+    """
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.intra_op_num_threads = intra_op_threads()
+    options.inter_op_num_threads = 1
+
+    providers = ["CPUExecutionProvider"]
+    provider_options = [{}]
+    if settings.onnx_use_openvino:
+        if "OpenVINOExecutionProvider" in ort.get_available_providers():
+            providers.insert(0, "OpenVINOExecutionProvider")
+            provider_options.insert(0, {"device_type": "CPU"})
+        else:
+            logger.warning("[ONNX] OpenVINO execution provider not installed, using CPU provider")
+
+    return ort.InferenceSession(
+        str(model_path),
+        sess_options=options,
+        providers=providers,
+        provider_options=provider_options,
+    )
@@ -11,6 +11,23 @@ from app.core.config import settings
 logger = logging.getLogger(__name__)
 
 
+# Target languages for lecture translation
+TRANSLATION_LANGUAGE_NAMES = {
+    "zh": "Chinese (Mandarin)",
+    "hi": "Hindi",
+    "es": "Spanish",
+    "fr": "French",
+    "bn": "Bengali",
+}
+
+# Output budget for one batched translation; batches are capped by input length
+BATCH_TRANSLATION_MAX_TOKENS = 2000
+
+
+class BatchTranslationMismatchError(ValueError):
+    """The model's batch response didn't contain one translation per segment."""
+
+
 class OpenRouterClient:
     """Client for OpenRouter API (LLM and embeddings)."""
 
@@ -190,68 +207,6 @@ class OpenRouterClient:
             logger.error(f"Embedding creation failed: {e}")
             raise
 
-    async def extract_keywords(self, text: str) -> list[str]:
-        """Extract keywords from text using LLM.
-
-        Args:
-            text: Text to extract keywords from
-
-        Returns:
-            List of keywords
-        """
-        prompt = f"""Extract 3-5 key academic terms from this lecture transcript segment.
-Focus on: technical terms, proper nouns, concept names.
-Return ONLY a JSON array of strings, no other text.
-
-Text: "{text}"
-"""
-        try:
-            response = await self.generate_text(
-                prompt=prompt,
-                temperature=0.1,
-                max_tokens=200,
-            )
-            # Parse JSON response
-            keywords = json.loads(response.strip())
-            if isinstance(keywords, list):
-                return keywords[:5]
-            return []
-        except (json.JSONDecodeError, Exception) as e:
-            logger.error(f"Keyword extraction failed: {e}")
-            return []
-
-    async def expand_concepts(self, keywords: list[str]) -> list[str]:
-        """Expand keywords with related concepts.
-
-        Args:
-            keywords: List of keywords to expand
-
-        Returns:
-            List of expanded concepts
-        """
-        if not keywords:
-            return []
-
-        prompt = f"""Given these academic keywords, suggest 2-3 related concepts that might appear in course materials.
-Focus on: synonyms, broader concepts, related technical terms.
-Return ONLY a JSON array of strings, no other text.
-
-Keywords: {json.dumps(keywords)}
-"""
-        try:
-            response = await self.generate_text(
-                prompt=prompt,
-                temperature=0.2,
-                max_tokens=200,
-            )
-            concepts = json.loads(response.strip())
-            if isinstance(concepts, list):
-                return concepts[:6]
-            return []
-        except (json.JSONDecodeError, Exception) as e:
-            logger.error(f"Concept expansion failed: {e}")
-            return []
-
     async def translate_question(
         self,
         text: str,
@@ -308,15 +263,7 @@ Respond in this EXACT JSON format only, no other text:
         Returns:
             Translated text in target language
         """
-        language_names = {
-            "zh": "Chinese (Mandarin)",
-            "hi": "Hindi",
-            "es": "Spanish",
-            "fr": "French",
-            "bn": "Bengali",
-        }
-        
-        target_name = language_names.get(target_language, target_language)
+        target_name = TRANSLATION_LANGUAGE_NAMES.get(target_language, target_language)
         
         prompt = f"""You are a real-time lecture translator. Translate the following English text to {target_name}.
 
@@ -342,6 +289,61 @@ English text: "{text}"
             logger.error(f"Translation to {target_language} failed: {e}")
             raise ValueError(f"Translation failed: {e}")
 
+    async def translate_batch_to_language(
+        self,
+        texts: list[str],
+        target_language: str,
+    ) -> list[str]:
+        """Translate several English segments to a target language in one request.
+
+        Args:
+            texts: English text segments, in order
+            target_language: Target language code (zh, hi, es, fr, bn)
+
+        Returns:
+            Translated segments, one per input segment
+
+        Raises:
+            BatchTranslationMismatchError: If the response isn't a JSON array with one
+                string per segment (the segments can be retried one by one)
+            ValueError: If the request itself failed
+        """
+        target_name = TRANSLATION_LANGUAGE_NAMES.get(target_language, target_language)
+
+        prompt = f"""You are a real-time lecture translator. Translate each English segment in the JSON array below to {target_name}.
+
+Rules:
+1. Translate naturally and fluently, as if spoken by a native speaker
+2. Preserve the academic/educational tone
+3. Keep technical terms accurate
+4. Do not add explanations or commentary
+5. Translate each segment separately; do not merge or split segments
+
+English segments: {json.dumps(texts, ensure_ascii=False)}
+
+Respond with ONLY a JSON array of {len(texts)} {target_name} strings, in the same order:"""
+
+        try:
+            response = await self.generate_text(
+                prompt=prompt,
+                temperature=0.3,
+                max_tokens=min(1000 * len(texts), BATCH_TRANSLATION_MAX_TOKENS),
+            )
+        except Exception as e:
+            logger.error(f"Batch translation to {target_language} failed: {e}")
+            raise ValueError(f"Translation failed: {e}")
+
+        try:
+            translations = json.loads(response.strip())
+        except json.JSONDecodeError as e:
+            raise BatchTranslationMismatchError(f"Translation failed: invalid JSON array: {e}")
+
+        if not isinstance(translations, list) or len(translations) != len(texts):
+            raise BatchTranslationMismatchError(
+                f"Translation failed: expected {len(texts)} segments, got {translations!r:.100}"
+            )
+        return [str(translation).strip() for translation in translations]
+
 
 # Singleton instance
 _openrouter_client: Optional[OpenRouterClient] = None
@@ -4,9 +4,12 @@ This module provides a client for interacting with Pinecone's serverless
 vector database. It replaces ChromaDB for cloud-native deployment.
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Union
 
+import numpy as np
 from pinecone import Pinecone, ServerlessSpec
 
 from app.core.config import settings
@@ -14,6 +17,22 @@ from app.core.config import settings
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class PineconeHits:
+    """Matches for one query vector, as parallel columns.
+
+    Distances are 1 - cosine similarity (lower = better).
+    """
+
+    ids: List[str]
+    documents: List[str]
+    metadatas: List[Dict[str, Any]]
+    distances: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
 class PineconeClient:
     """Client for interacting with Pinecone vector database.
     
@@ -29,8 +48,21 @@ class PineconeClient:
         logger.info(f"PineconeClient configured for index: {self.index_name}")
 
     def _get_client(self) -> Pinecone:
-        """Get or create the Pinecone client."""
+        """Get or create the Pinecone client.
+
+        Uses the gRPC transport when installed (protobuf instead of JSON over a
+        persistent HTTP/2 channel), falling back to the REST client.
+        """
         if self._client is None:
+            if settings.pinecone_use_grpc:
+                try:
+                    from pinecone.grpc import PineconeGRPC
+
+                    self._client = PineconeGRPC(api_key=self.api_key)
+                    logger.info("Using Pinecone gRPC transport")
+                    return self._client
+                except ImportError:
+                    logger.warning("pinecone[grpc] not installed, using REST transport")
             self._client = Pinecone(api_key=self.api_key)
         return self._client
 
@@ -133,35 +165,36 @@ class PineconeClient:
     async def query(
         self,
         collection_name: str,
-        query_embeddings: List[List[float]],
+        query_embeddings: List[Union[List[float], np.ndarray]],
         n_results: int = 10,
         where: Optional[Dict] = None,
-    ) -> Dict:
+    ) -> PineconeHits:
         """Query Pinecone index.
         
         Args:
             collection_name: Namespace to query
-            query_embeddings: Query vectors (list of lists)
+            query_embeddings: Query vectors (lists or float32 arrays)
             n_results: Number of results to return
             where: Metadata filter (e.g., {"session_id": "abc123"})
         
         Returns:
-            Dict with keys: ids, documents, metadatas, distances
-            Format matches ChromaDB for compatibility.
+            Matches for the first query embedding
         """
         try:
             index = self._get_index()
             
-            # Pinecone queries one embedding at a time
-            query_embedding = query_embeddings[0]
+            # Pinecone queries one embedding at a time; the SDK needs a list of floats,
+            # so arrays are converted once here in a single C-level pass
+            query_embedding = np.asarray(query_embeddings[0], dtype=np.float32).tolist()
             
             # Convert ChromaDB-style where to Pinecone filter format
             filter_dict = None
             if where:
                 filter_dict = self._convert_filter(where)
             
-            # Query Pinecone
-            results = index.query(
+            # Query Pinecone off the event loop so concurrent work isn't blocked
+            results = await asyncio.to_thread(
+                index.query,
                 vector=query_embedding,
                 top_k=n_results,
                 include_metadata=True,
@@ -169,23 +202,19 @@ class PineconeClient:
                 filter=filter_dict
             )
             
-            # Convert to ChromaDB-compatible format
-            ids = [[match.id for match in results.matches]]
-            documents = [[match.metadata.get("document", "") for match in results.matches]]
-            metadatas = [[match.metadata for match in results.matches]]
+            matches = results.matches
             # Pinecone returns similarity scores (higher = better)
-            # Convert to distances (lower = better) for ChromaDB compatibility
-            distances = [[1.0 - match.score for match in results.matches]]
-            
-            num_results = len(results.matches)
-            logger.debug(f"[Pinecone] Query on '{collection_name}' returned {num_results} results")
-            
-            return {
-                "ids": ids,
-                "documents": documents,
-                "metadatas": metadatas,
-                "distances": distances,
-            }
+            # Convert to distances (lower = better)
+            scores = np.fromiter((match.score for match in matches), dtype=np.float32, count=len(matches))
+            hits = PineconeHits(
+                ids=[match.id for match in matches],
+                documents=[match.metadata.get("document", "") for match in matches],
+                metadatas=[match.metadata for match in matches],
+                distances=1.0 - scores,
+            )
+
+            logger.debug(f"[Pinecone] Query on '{collection_name}' returned {len(hits)} results")
+            return hits
         except Exception as e:
             logger.error(f"Error querying Pinecone: {e}")
             raise
@@ -271,6 +300,8 @@ class PineconeClient:
 
     async def close(self):
         """Close the client."""
+        if self._index is not None and hasattr(self._index, "close"):
+            self._index.close()
         self._client = None
         self._index = None
 
@@ -284,3 +315,11 @@ def get_pinecone_client() -> PineconeClient:
     if _pinecone_client is None:
         _pinecone_client = PineconeClient()
     return _pinecone_client
+
+
+async def close_pinecone_client():
+    """Close global Pinecone client."""
+    global _pinecone_client
+    if _pinecone_client is not None:
+        await _pinecone_client.close()
+        _pinecone_client = None
@@ -6,12 +6,19 @@ Uses Convex + Pinecone for all data storage (fully cloud-native).
 import logging
 from contextlib import asynccontextmanager
 
+from app.core.config import settings
+from app.core.cpu import configure_thread_env, configure_torch_threads
+
+# Thread pools are sized when torch/onnxruntime load, so this runs before the routes import them
+configure_thread_env()
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routes import api_router
-from app.core.config import settings
 from app.external.convex import close_convex_client
+from app.external.pinecone import close_pinecone_client
+from app.services.rag import get_rag_service
 
 # Configure logging
 logging.basicConfig(
@@ -29,11 +36,21 @@ async def lifespan(app: FastAPI):
     logger.info(f"Debug mode: {settings.debug}")
     logger.info("Using Convex + Pinecone for all data storage (fully cloud-native)")
 
+    configure_torch_threads()
+
+    # Load models once so the first transcript window doesn't pay the cold start
+    if settings.rag_warmup_on_startup:
+        try:
+            await get_rag_service().warmup()
+        except Exception as e:
+            logger.error(f"RAG model warmup failed: {e}")
+
     yield
 
     # Shutdown
     logger.info("Shutting down Rosetta API...")
     await close_convex_client()
+    await close_pinecone_client()
 
 
 # Create FastAPI application
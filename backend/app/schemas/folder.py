@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class FolderBase(BaseModel):
@@ -38,8 +38,7 @@ class SessionSummary(BaseModel):
     has_notes: bool
     document_count: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class FolderResponse(BaseModel):
@@ -51,8 +50,7 @@ class FolderResponse(BaseModel):
     updated_at: datetime
     session_count: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class FolderDetail(BaseModel):
@@ -64,8 +62,7 @@ class FolderDetail(BaseModel):
     updated_at: datetime
     sessions: List[SessionSummary]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class FoldersListResponse(BaseModel):
@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class NoteGenerateRequest(BaseModel):
@@ -37,8 +37,7 @@ class NoteResponse(BaseModel):
     word_count: int
     citation_count: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class NoteStatusResponse(BaseModel):
@@ -30,7 +30,7 @@ class QueryMetadata(BaseModel):
     """Schema for query processing metadata."""
 
     keywords: List[str]
-    expanded_concepts: List[str]
+    expanded_concepts: List[str] = []  # Deprecated: concept expansion was removed
     processing_time_ms: int
 
 
@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.core.config import settings
 
@@ -24,12 +24,12 @@ class SessionCreate(SessionBase):
     @property
     def is_valid_source_language(self) -> bool:
         """Validate source language."""
-        return self.source_language in settings.supported_languages
+        return self.source_language in settings.supported_language_codes
 
     @property
     def is_valid_target_language(self) -> bool:
         """Validate target language."""
-        return self.target_language in settings.supported_languages
+        return self.target_language in settings.supported_language_codes
 
 
 class SessionUpdate(BaseModel):
@@ -61,8 +61,7 @@ class DocumentSummary(BaseModel):
     page_count: int
     status: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SessionResponse(BaseModel):
@@ -78,8 +77,7 @@ class SessionResponse(BaseModel):
     ended_at: Optional[datetime]
     has_notes: bool
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SessionDetail(BaseModel):
@@ -96,5 +94,4 @@ class SessionDetail(BaseModel):
     documents: List[DocumentSummary]
     has_notes: bool
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
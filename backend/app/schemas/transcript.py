@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class SegmentCreate(BaseModel):
@@ -24,8 +24,7 @@ class CitationBrief(BaseModel):
     page_number: int
     snippet: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class TranscriptSegmentResponse(BaseModel):
@@ -39,8 +38,7 @@ class TranscriptSegmentResponse(BaseModel):
     confidence: float
     citations: List[CitationBrief]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class TranscriptResponse(BaseModel):
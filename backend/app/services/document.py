@@ -20,6 +20,9 @@ from app.external.embeddings import LocalEmbeddingService
 
 logger = logging.getLogger(__name__)
 
+# Blank lines separate paragraphs in extracted PDF text
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+
 
 class ConvexDocumentProcessingService:
     """Service for processing documents stored in Convex.
@@ -160,9 +163,13 @@ class ConvexDocumentProcessingService:
         return pages
 
     def _chunk_text(self, pages: list[dict]) -> list[dict]:
-        """Chunk text with overlap, respecting page boundaries."""
+        """Chunk text with overlap, respecting page boundaries.
+
+        Paragraphs are collected in a list and joined once per chunk, so
+        building a chunk is linear in its length.
+        """
         chunks = []
-        current_chunk = ""
+        current_parts: list[str] = []
         current_page = 1
         current_tokens = 0
 
@@ -171,7 +178,7 @@ class ConvexDocumentProcessingService:
             page_number = page["page_number"]
 
             # Split into paragraphs
-            paragraphs = re.split(r"\n\s*\n", page_text)
+            paragraphs = _PARAGRAPH_BREAK.split(page_text)
 
             for para in paragraphs:
                 para = para.strip()
@@ -183,6 +190,7 @@ class ConvexDocumentProcessingService:
 
                 if current_tokens + para_tokens > self.TARGET_CHUNK_SIZE:
                     # Save current chunk
+                    current_chunk = " ".join(current_parts)
                     if current_chunk:
                         chunks.append({
                             "content": current_chunk.strip(),
@@ -193,14 +201,15 @@ class ConvexDocumentProcessingService:
 
                     # Start new chunk with overlap
                     overlap_text = self._get_overlap_text(current_chunk)
-                    current_chunk = overlap_text + " " + para if overlap_text else para
+                    current_parts = [overlap_text, para] if overlap_text else [para]
                     current_page = page_number
-                    current_tokens = len(current_chunk) // 4
+                    current_tokens = len(" ".join(current_parts)) // 4
                 else:
-                    current_chunk += " " + para if current_chunk else para
+                    current_parts.append(para)
                     current_tokens += para_tokens
 
         # Save final chunk
+        current_chunk = " ".join(current_parts)
         if current_chunk:
             chunks.append({
                 "content": current_chunk.strip(),
@@ -213,14 +222,14 @@ class ConvexDocumentProcessingService:
 
     def _get_overlap_text(self, text: str) -> str:
         """Get the last ~50 tokens of text for overlap."""
-        words = text.split()
-        overlap_words = words[-(self.CHUNK_OVERLAP // 2):]
+        # Split from the right only as far as needed instead of tokenizing the whole chunk
+        n_words = self.CHUNK_OVERLAP // 2
+        overlap_words = text.rsplit(maxsplit=n_words)[-n_words:]
         return " ".join(overlap_words)
 
     def _detect_heading(self, text: str) -> Optional[str]:
         """Detect section heading from text."""
-        lines = text.split("\n")
-        for line in lines[:3]:
+        for line in text.split("\n", 3)[:3]:
             line = line.strip()
             if len(line) < 100 and len(line) > 3:
                 if line.isupper() or line.istitle():
@@ -3,6 +3,7 @@
 Uses Convex + Pinecone for all data storage (fully cloud-native).
 """
 
+import asyncio
 import logging
 from datetime import datetime
 from typing import Optional
@@ -170,17 +171,18 @@ class NoteService:
         if not notes:
             return None
 
-        # Get citation count
+        # Get citation count; skipped above for sessions without notes yet
         citations = await self.convex_client.get_citations(session_id)
 
+        content = notes.get("contentMarkdown", "")
         return NoteResponse(
             id=notes.get("_id", ""),
             session_id=session_id,
-            content_markdown=notes.get("contentMarkdown", ""),
+            content_markdown=content,
             generated_at=datetime.fromtimestamp(notes.get("generatedAt", 0) / 1000),
             last_edited_at=datetime.fromtimestamp(notes.get("lastEditedAt", 0) / 1000),
             version=notes.get("version", 1),
-            word_count=len(notes.get("contentMarkdown", "").split()),
+            word_count=len(content.split()),
             citation_count=len(citations),
         )
 
@@ -200,18 +202,19 @@ class NoteService:
         Returns:
             Generated notes
         """
-        # Check if notes already exist
-        existing = await self.convex_client.get_notes(session_id)
-        if existing and not force_regenerate:
-            logger.info(f"Notes already exist for session {session_id}, will update them")
-
         # Update status
         self._generation_status[session_id] = {"status": "generating", "progress": 0}
 
         try:
-            # Get transcript from Convex
-            transcript_data = await self.convex_client.get_full_transcript(session_id)
-            transcript_text = transcript_data.get("originalText", "")
+            # Check for existing notes while fetching transcript and citations
+            existing, note_context = await asyncio.gather(
+                self.convex_client.get_notes(session_id),
+                self.convex_client.get_note_context(session_id),
+            )
+            if existing and not force_regenerate:
+                logger.info(f"Notes already exist for session {session_id}, will update them")
+
+            transcript_text = note_context.get("originalText", "")
             
             if not transcript_text:
                 raise HTTPException(
@@ -222,10 +225,7 @@ class NoteService:
                     },
                 )
 
-            self._generation_status[session_id]["progress"] = 20
-
-            # Get citations from Convex
-            citations = await self.convex_client.get_citations(session_id)
+            citations = note_context.get("citations", [])
             
             self._generation_status[session_id]["progress"] = 30
             
@@ -309,14 +309,15 @@ class NoteService:
         Returns:
             Updated notes
         """
-        # Update notes in Convex
-        note_id = await self.convex_client.upsert_notes(
-            session_id=session_id,
-            content_markdown=content,
+        # Update notes in Convex while reading the citation count
+        note_id, citations = await asyncio.gather(
+            self.convex_client.upsert_notes(
+                session_id=session_id,
+                content_markdown=content,
+            ),
+            self.convex_client.get_citations(session_id),
         )
 
-        citations = await self.convex_client.get_citations(session_id)
-
         return NoteResponse(
             id=note_id,
             session_id=session_id,
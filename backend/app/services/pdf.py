@@ -1,12 +1,31 @@
 """PDF generation service for exporting notes."""
 
 import logging
+import re
 from io import BytesIO
 from datetime import datetime
+from html import unescape
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# HTML-to-text rewrites, compiled once and applied in order
+_HTML_TEXT_REWRITES = [
+    # Remove script and style elements
+    (re.compile(r'<script[^>]*>.*?</script>', re.DOTALL), ''),
+    (re.compile(r'<style[^>]*>.*?</style>', re.DOTALL), ''),
+    # Convert some HTML elements
+    (re.compile(r'<br\s*/?>'), '\n'),
+    (re.compile(r'<p[^>]*>'), '\n\n'),
+    (re.compile(r'</p>'), ''),
+    (re.compile(r'<h[1-6][^>]*>'), '\n\n'),
+    (re.compile(r'</h[1-6]>'), '\n'),
+    (re.compile(r'<li[^>]*>'), '\n• '),
+    # Remove remaining HTML tags
+    (re.compile(r'<[^>]+>'), ''),
+]
+_EXCESS_NEWLINES = re.compile(r'\n{3,}')
+
 
 class PDFService:
     """Service for generating PDF exports of notes."""
@@ -284,29 +303,15 @@ class PDFService:
     
     def _html_to_text(self, html: str) -> str:
         """Convert HTML to plain text (simplified)."""
-        import re
-        
-        # Remove script and style elements
-        text = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL)
-        text = re.sub(r'<style[^>]*>.*?</style>', '', text, flags=re.DOTALL)
-        
-        # Convert some HTML elements
-        text = re.sub(r'<br\s*/?>', '\n', text)
-        text = re.sub(r'<p[^>]*>', '\n\n', text)
-        text = re.sub(r'</p>', '', text)
-        text = re.sub(r'<h[1-6][^>]*>', '\n\n', text)
-        text = re.sub(r'</h[1-6]>', '\n', text)
-        text = re.sub(r'<li[^>]*>', '\n• ', text)
-        
-        # Remove remaining HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
+        text = html
+        for pattern, replacement in _HTML_TEXT_REWRITES:
+            text = pattern.sub(replacement, text)
         
         # Decode HTML entities
-        import html
-        text = html.unescape(text)
+        text = unescape(text)
         
         # Clean up whitespace
-        text = re.sub(r'\n{3,}', '\n\n', text)
+        text = _EXCESS_NEWLINES.sub('\n\n', text)
         text = text.strip()
         
         return text
@@ -51,7 +51,7 @@ class QuestionTranslationService:
 
             # Validate detected language
             detected_lang = result.get("detected_language", "")
-            if detected_lang not in settings.supported_languages:
+            if detected_lang not in settings.supported_language_codes:
                 # Allow translation but note unsupported
                 logger.warning(f"Detected unsupported language: {detected_lang}")
 
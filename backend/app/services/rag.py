@@ -1,22 +1,46 @@
 """RAG pipeline service for citation retrieval.
 
 Optimized pipeline using local models:
-- KeyBERT for keyword extraction
+- KeyBERT-style keyword extraction on the shared embedding model
 - bge-base-en-v1.5 for embeddings
-- TinyBERT cross-encoder for re-ranking
+- TinyBERT cross-encoder for re-ranking (INT8 ONNX Runtime)
 - Distance-based early exit for efficiency
 
 This version uses Convex + Pinecone (fully cloud-native).
 """
 
+import asyncio
+import copy
+import functools
+import hashlib
+import heapq
+import itertools
 import logging
+import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 
+import numpy as np
+from cachetools import LRUCache, TTLCache
+
 from app.core.config import settings
-from app.external.pinecone import PineconeClient
-from app.external.convex import ConvexClient
-from app.external.embeddings import LocalEmbeddingService
+from app.core.cpu import rag_cpu_workers
+from app.external.pinecone import PineconeClient, PineconeHits, get_pinecone_client
+from app.external.convex import ConvexClient, get_convex_client
+from app.external.embeddings import (
+    PARITY_PROBES,
+    LocalEmbeddingService,
+    get_local_embedding_service,
+    scores_match_fp32,
+)
+from app.external.onnx_runtime import (
+    QUANTIZED_MODEL_FILE,
+    create_cpu_session,
+    export_quantized_model,
+    fix_input_shapes,
+)
 from app.schemas.rag import (
     CitationResult,
     QueryMetadata,
@@ -25,38 +49,58 @@ from app.schemas.rag import (
 
 logger = logging.getLogger(__name__)
 
+# CountVectorizer's default token pattern, compiled once
+_TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+
+def _text_digest(text: str) -> bytes:
+    """Short blake2b digest of text, used as a cache key."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def _candidate_distances(candidates: List[dict], default: float) -> np.ndarray:
+    """Pinecone distances of candidates as a float32 array."""
+    return np.fromiter(
+        (c.get("distance", default) for c in candidates),
+        dtype=np.float32,
+        count=len(candidates),
+    )
+
+
+def _rank_by_distance(candidates: List[dict], top_k: int) -> List[dict]:
+    """Score the first top_k candidates from their Pinecone distance."""
+    top = candidates[:top_k]
+    # Convert distance to similarity score (0-1 range)
+    scores = np.maximum(0.0, 1.0 - _candidate_distances(top, 1.0) / 2.0)
+    for c, score in zip(top, scores.tolist()):
+        c["relevance_score"] = score
+    return top
+
 
 class KeywordExtractor:
-    """Service for extracting keywords using KeyBERT.
+    """Service for extracting keywords using embedding similarity.
     
-    KeyBERT uses embedding similarity to identify semantically important terms,
-    which aligns well with vector retrieval.
+    Follows KeyBERT: candidate 1-2 word phrases are ranked by similarity to the
+    document embedding, then diversified with Max Sum Similarity. Embeddings come
+    from the shared bge model, so no second BERT is loaded.
     """
 
-    def __init__(self, model_name: Optional[str] = None):
-        self.model_name = model_name or settings.keybert_model
-        self._model = None
+    NGRAM_RANGE = (1, 2)
+    NR_CANDIDATES = 20
 
-    @property
-    def model(self):
-        """Lazy load the KeyBERT model."""
-        if self._model is None:
-            try:
-                from keybert import KeyBERT
-                logger.info(f"Loading KeyBERT with model: {self.model_name}")
-                self._model = KeyBERT(self.model_name)
-                logger.info("KeyBERT model loaded successfully")
-            except Exception as e:
-                logger.error(f"Failed to load KeyBERT: {e}")
-                self._model = None
-        return self._model
-
-    def extract_keywords(self, text: str, top_n: int = 5) -> List[str]:
+    def __init__(self, embedding_service: LocalEmbeddingService):
+        self.embedding_service = embedding_service
+        # Overlapping transcript windows repeat text; keyed on (digest, top_n, use_maxsum)
+        self._cache: LRUCache = LRUCache(maxsize=settings.rag_keyword_cache_size)
+        self._cache_lock = threading.Lock()
+
+    def extract_keywords(self, text: str, top_n: int = 5, use_maxsum: bool = False) -> List[str]:
         """Extract keywords from text.
 
         Args:
             text: Text to extract keywords from
             top_n: Number of keywords to extract
+            use_maxsum: Diversify keywords with Max Sum Similarity (O(nr_candidates^2))
 
         Returns:
             List of extracted keywords
@@ -64,95 +108,252 @@ class KeywordExtractor:
         if not text or len(text.strip()) < 10:
             return []
 
-        if self.model is None:
-            logger.warning("KeyBERT not available, returning empty keywords")
-            return []
+        cache_key = (_text_digest(text), top_n, use_maxsum)
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
 
+        keywords = self._extract_keywords(text, top_n, use_maxsum)
+        with self._cache_lock:
+            self._cache[cache_key] = tuple(keywords)
+        return keywords
+
+    def _extract_keywords(self, text: str, top_n: int, use_maxsum: bool) -> List[str]:
+        """Extract keywords from text without consulting the cache."""
         try:
-            # Extract keywords with KeyBERT
-            # Use n-gram range of 1-2 to capture both single words and phrases
-            keywords_with_scores = self.model.extract_keywords(
-                text,
-                keyphrase_ngram_range=(1, 2),
-                stop_words="english",
-                top_n=top_n,
-                use_maxsum=True,  # Maximize diversity
-                nr_candidates=20,
-            )
-            
-            # Extract just the keyword strings
-            keywords = [kw for kw, score in keywords_with_scores]
-            logger.debug(f"[KeyBERT] Extracted keywords: {keywords}")
+            candidates = self._candidate_phrases(text)
+            if not candidates:
+                return []
+
+            # Document and candidates are embedded in one batch
+            embeddings = self.embedding_service.encode([text, *candidates])
+            doc_embedding, candidate_embeddings = embeddings[0], embeddings[1:]
+
+            # Embeddings are L2-normalized, so dot product is cosine similarity
+            similarities = candidate_embeddings @ doc_embedding
+            if use_maxsum:
+                top_idx = np.argsort(similarities)[-self.NR_CANDIDATES:]
+                selected = top_idx[self._max_sum(candidate_embeddings[top_idx], top_n)]
+                selected = selected[np.argsort(-similarities[selected])]
+            else:
+                selected = np.argsort(-similarities)[:top_n]
+
+            keywords = [candidates[i] for i in selected]
+            logger.debug("[Keywords] Extracted keywords: %s", keywords)
             return keywords
 
         except Exception as e:
-            logger.error(f"Keyword extraction failed: {e}")
+            logger.error("Keyword extraction failed: %s", e)
             return []
 
+    def _candidate_phrases(self, text: str) -> List[str]:
+        """Build stopword-filtered 1-2 word candidate phrases from text."""
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        vectorizer = CountVectorizer(
+            ngram_range=self.NGRAM_RANGE,
+            stop_words="english",
+            tokenizer=_TOKEN_PATTERN.findall,
+            token_pattern=None,
+        )
+        try:
+            vectorizer.fit([text])
+        except ValueError:
+            # Text contains only stop words
+            return []
+        return vectorizer.get_feature_names_out().tolist()
+
+    def _max_sum(self, embeddings: np.ndarray, top_n: int) -> np.ndarray:
+        """Pick the top_n candidates with the lowest pairwise similarity.
+
+        Args:
+            embeddings: Normalized embeddings of the nearest candidates
+
+        Returns:
+            Indices into embeddings
+        """
+        if top_n >= len(embeddings):
+            return np.arange(len(embeddings))
+
+        pairwise = embeddings @ embeddings.T
+        combinations = np.array(list(itertools.combinations(range(len(embeddings)), top_n)))
+        scores = pairwise[combinations[:, :, None], combinations[:, None, :]].sum(axis=(1, 2))
+        return combinations[np.argmin(scores)]
+
 
 class QueryEnrichmentService:
-    """Service for enriching RAG queries with keywords.
+    """Service for extracting the keywords reported with RAG queries.
     
-    Uses KeyBERT for local keyword extraction instead of LLM API calls.
+    Uses local embedding-based keyword extraction instead of LLM API calls.
     """
 
     def __init__(self, keyword_extractor: KeywordExtractor):
         self.keyword_extractor = keyword_extractor
 
-    def enrich_query(self, text: str) -> dict:
-        """Enrich a query with extracted keywords.
+    def extract_keywords(self, text: str) -> List[str]:
+        """Extract the top keywords of a transcript window.
 
         Args:
             text: Original transcript text
 
         Returns:
-            Dict with keywords and enriched query
+            List of extracted keywords
         """
-        # Extract keywords using KeyBERT
-        keywords = self.keyword_extractor.extract_keywords(text, top_n=5)
-
-        # Build enriched query by appending keywords
-        enriched_query = self._build_enriched_query(text, keywords)
-
-        return {
-            "keywords": keywords,
-            "concepts": [],  # No longer using concept expansion
-            "enriched_query": enriched_query,
-        }
-
-    def _build_enriched_query(self, original_text: str, keywords: List[str]) -> str:
-        """Build enriched query from components."""
-        if not keywords:
-            return original_text
-            
-        # Append keywords to original text for embedding
-        keyword_str = " ".join(keywords)
-        return f"{original_text} {keyword_str}"
+        return self.keyword_extractor.extract_keywords(text, top_n=5)
 
 
 class RerankerService:
     """Service for re-ranking search results using cross-encoder.
     
     Uses TinyBERT (2 layers) for fast inference while maintaining quality.
+    Runs as an INT8-quantized ONNX Runtime session when available, with the
+    PyTorch CrossEncoder as fallback.
     """
 
+    # Pairs are tokenized together and padded to the longest pair, capped here
+    MAX_SEQ_LENGTH = 256
+
     def __init__(self, model_name: Optional[str] = None):
         self.model_name = model_name or settings.reranker_model
         self._model = None
+        self._session = None
+        self._tokenizer = None
+        self._input_names: List[str] = []
+        self._static_batch_size: Optional[int] = None
+        self._bfloat16 = False
+        # Loaded lazily from RAG pool threads; one thread loads, the rest wait
+        self._load_lock = threading.Lock()
+        self._loaded = False
 
     @property
     def model(self):
-        """Lazy load the cross-encoder model."""
-        if self._model is None:
-            try:
-                from sentence_transformers import CrossEncoder
-                logger.info(f"Loading cross-encoder: {self.model_name}")
-                self._model = CrossEncoder(self.model_name)
-                logger.info(f"Cross-encoder loaded: {self.model_name}")
-            except Exception as e:
-                logger.error(f"Failed to load cross-encoder: {e}")
-                self._model = None
-        return self._model
+        """Lazy load the cross-encoder (ONNX session or CrossEncoder)."""
+        if not self._loaded:
+            with self._load_lock:
+                if not self._loaded:
+                    if settings.reranker_use_onnx:
+                        self._load_onnx_session()
+                    if self._session is None:
+                        self._load_cross_encoder()
+                    # Set only once a model is fully loaded; failed loads are retried
+                    self._loaded = self._session is not None or self._model is not None
+        return self._session if self._session is not None else self._model
+
+    def _load_onnx_session(self) -> None:
+        """Load the INT8-quantized ONNX export of the cross-encoder."""
+        try:
+            from transformers import AutoTokenizer
+            logger.info("Loading ONNX cross-encoder: %s", self.model_name)
+            model_dir = export_quantized_model(self.model_name, task="text-classification")
+            self._tokenizer = AutoTokenizer.from_pretrained(model_dir)
+            model_path = model_dir / QUANTIZED_MODEL_FILE
+            if settings.reranker_static_shape:
+                batch_size = settings.rag_top_k_candidates
+                model_path = fix_input_shapes(model_path, batch_size, self.MAX_SEQ_LENGTH)
+                self._static_batch_size = batch_size
+            self._session = create_cpu_session(model_path)
+            self._input_names = [i.name for i in self._session.get_inputs()]
+            logger.info("ONNX cross-encoder loaded: %s", self.model_name)
+        except Exception as e:
+            logger.warning("ONNX cross-encoder unavailable, using PyTorch: %s", e)
+            self._session = None
+            self._static_batch_size = None
+
+    def _load_cross_encoder(self) -> None:
+        """Load the PyTorch CrossEncoder."""
+        try:
+            from sentence_transformers import CrossEncoder
+            logger.info("Loading cross-encoder: %s", self.model_name)
+            self._model = CrossEncoder(self.model_name, max_length=self.MAX_SEQ_LENGTH)
+            self._model.model.eval()
+            if settings.torch_bfloat16:
+                self._enable_bfloat16()
+            logger.info("Cross-encoder loaded: %s", self.model_name)
+        except Exception as e:
+            logger.error("Failed to load cross-encoder: %s", e)
+            self._model = None
+
+    def _enable_bfloat16(self) -> None:
+        """Cast the cross-encoder to BF16, keeping FP32 if scores drift from FP32."""
+        import torch
+
+        pairs = [[probe, text] for probe in PARITY_PROBES[:2] for text in PARITY_PROBES]
+        reference = self._predict_batch(pairs)
+        fp32_model = self._model.model
+        self._model.model = copy.deepcopy(fp32_model).to(dtype=torch.bfloat16)
+        self._bfloat16 = True
+
+        if not scores_match_fp32(reference, self._predict_batch(pairs)):
+            logger.warning("BF16 cross-encoder scores diverge from FP32, keeping FP32 model")
+            self._model.model = fp32_model
+            self._bfloat16 = False
+
+    def _predict_batch(self, pairs: List[List[str]]) -> np.ndarray:
+        """Score query-candidate pairs in a single padded forward pass.
+
+        Returns sigmoid relevance scores, matching CrossEncoder.predict.
+        """
+        queries = [query for query, _ in pairs]
+        texts = [text for _, text in pairs]
+
+        if self._session is not None:
+            if self._static_batch_size is None:
+                return self._run_session(queries, texts)
+
+            batch_size = self._static_batch_size
+            return np.concatenate([
+                self._run_session(queries[i:i + batch_size], texts[i:i + batch_size])
+                for i in range(0, len(pairs), batch_size)
+            ])
+
+        import torch
+
+        encoded = self._model.tokenizer(
+            queries,
+            texts,
+            padding="longest",
+            truncation=True,
+            max_length=self.MAX_SEQ_LENGTH,
+            return_tensors="pt",
+        ).to(self._model.model.device)
+        with torch.inference_mode(), torch.autocast(
+            "cpu", dtype=torch.bfloat16, enabled=self._bfloat16
+        ):
+            logits = self._model.model(**encoded).logits.squeeze(-1)
+            return torch.sigmoid(logits).float().cpu().numpy()
+
+    def _run_session(self, queries: List[str], texts: List[str]) -> np.ndarray:
+        """Score one batch of pairs with the ONNX session.
+
+        A static-shape model gets the batch padded with empty pairs and every
+        pair padded to MAX_SEQ_LENGTH; scores for the padding are dropped.
+        """
+        n_pairs = len(queries)
+        padding = "longest"
+        if self._static_batch_size is not None:
+            n_dummy = self._static_batch_size - n_pairs
+            queries = queries + [""] * n_dummy
+            texts = texts + [""] * n_dummy
+            padding = "max_length"
+
+        encoded = self._tokenizer(
+            queries,
+            texts,
+            padding=padding,
+            truncation=True,
+            max_length=self.MAX_SEQ_LENGTH,
+            return_tensors="np",
+        )
+        inputs = {name: encoded[name].astype(np.int64) for name in self._input_names}
+        logits = self._session.run(None, inputs)[0][:n_pairs, 0]
+        # Same activation CrossEncoder applies to single-label models
+        return 1.0 / (1.0 + np.exp(-logits))
+
+    def warmup(self) -> None:
+        """Load the model and score one dummy pair."""
+        if self.model is not None:
+            self._predict_batch([["warmup query", "warmup candidate"]])
 
     def rerank(
         self,
@@ -182,49 +383,45 @@ class RerankerService:
             return self._fallback_ranking(candidates, top_k)
 
         try:
-            # Create query-candidate pairs
-            pairs = [[query, c.get("text", "")] for c in candidates]
+            # Create query-candidate pairs. Only the head of each chunk is scored, which
+            # keeps pairs short of MAX_SEQ_LENGTH and cuts tokenizer and attention cost.
+            max_chars = settings.rag_rerank_max_chars
+            pairs = [[query, c.get("text", "")[:max_chars]] for c in candidates]
 
             # Get scores from cross-encoder
-            scores = self.model.predict(pairs)
+            scores = self._predict_batch(pairs)
             
-            logger.debug(f"[Reranker] Raw scores: {[f'{s:.3f}' for s in scores]}")
-
-            # Combine candidates with scores
-            scored_candidates = list(zip(candidates, scores))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[Reranker] Raw scores: %s", [f"{s:.3f}" for s in scores])
 
-            # Sort by score descending
-            scored_candidates.sort(key=lambda x: x[1], reverse=True)
+            # Partial sort: only the top_k scores are ordered, descending
+            top_scored = heapq.nlargest(top_k, zip(candidates, scores), key=lambda x: x[1])
 
-            # Filter by threshold and take top_k
+            # Filter by threshold
             results = []
-            for candidate, score in scored_candidates[:top_k]:
-                logger.debug(f"[Reranker] Score: {score:.3f} (threshold: {settings.rag_relevance_threshold})")
+            for candidate, score in top_scored:
+                logger.debug("[Reranker] Score: %.3f (threshold: %s)", score, settings.rag_relevance_threshold)
                 if score >= settings.rag_relevance_threshold:
                     candidate["relevance_score"] = float(score)
                     results.append(candidate)
 
-            logger.info(f"[Reranker] {len(results)}/{len(candidates)} passed threshold")
+            logger.info("[Reranker] %d/%d passed threshold", len(results), len(candidates))
             return results
 
         except Exception as e:
-            logger.error(f"[Reranker] Re-ranking failed: {e}")
+            logger.error("[Reranker] Re-ranking failed: %s", e)
             return self._fallback_ranking(candidates, top_k)
 
     def _fallback_ranking(self, candidates: List[dict], top_k: int) -> List[dict]:
         """Fallback ranking using distance scores."""
-        for c in candidates:
-            distance = c.get("distance", 1.0)
-            # Convert distance to similarity score (0-1 range)
-            c["relevance_score"] = max(0, 1.0 - (distance / 2.0))
-        return candidates[:top_k]
+        return _rank_by_distance(candidates, top_k)
 
 
 class RAGService:
     """Service for RAG-based citation retrieval.
     
     Optimized pipeline using Convex + Pinecone (fully cloud-native):
-    1. KeyBERT keyword extraction (~15ms)
+    1. Keyword extraction on the shared embedding model (~15ms, overlaps 2-6)
     2. Local embedding with bge-base-en-v1.5 (~10ms)
     3. Pinecone vector search, top 5 (~20-30ms)
     4. Distance-based early exit (0ms)
@@ -247,6 +444,54 @@ class RAGService:
         self.convex_client = convex_client
         self.reranker = reranker
         self.query_enrichment = query_enrichment
+        # (session_id, transcript digest) -> Pinecone candidates. The TTL
+        # bounds staleness when documents are added to a session mid-lecture.
+        self._query_cache: TTLCache = TTLCache(
+            maxsize=settings.rag_query_cache_size,
+            ttl=settings.rag_query_cache_ttl_seconds,
+        )
+        self._query_cache_lock = threading.Lock()
+        # Bounded pool for CPU-bound model calls, so concurrent sessions run in
+        # parallel without blocking the event loop
+        self._cpu_pool = ThreadPoolExecutor(
+            max_workers=rag_cpu_workers(), thread_name_prefix="rag-cpu"
+        )
+
+    async def _run_cpu(self, func, *args, **kwargs):
+        """Run a CPU-bound call on the RAG worker pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._cpu_pool, functools.partial(func, *args, **kwargs))
+
+    def invalidate_session(self, session_id: str) -> None:
+        """Drop cached query results for a session.
+
+        Called when a session ends or its documents change.
+        """
+        with self._query_cache_lock:
+            stale_keys = [key for key in self._query_cache if key[0] == session_id]
+            for key in stale_keys:
+                self._query_cache.pop(key, None)
+        if stale_keys:
+            logger.debug(
+                "[RAG] Invalidated %d cached queries for session %s", len(stale_keys), session_id
+            )
+
+    async def warmup(self) -> None:
+        """Load all models and run one dummy inference through each stage.
+
+        Called at startup so the first transcript window does not pay the
+        multi-second model load inside the RAG critical path.
+        """
+        start_time = time.time()
+        await self._run_cpu(self._warmup_models)
+        warmup_time = int((time.time() - start_time) * 1000)
+        logger.info("[RAG] Models warmed up in %dms", warmup_time)
+
+    def _warmup_models(self) -> None:
+        """Run dummy inference on the embedder, keyword extractor and reranker."""
+        self.embedding_service.create_embedding("warmup")
+        self.query_enrichment.extract_keywords("Warmup text for keyword extraction.")
+        self.reranker.warmup()
 
     async def query(
         self,
@@ -254,6 +499,7 @@ class RAGService:
         transcript_text: str,
         window_index: int,
         transcript_id: Optional[str] = None,  # Convex transcript ID (string)
+        include_keywords: bool = True,
     ) -> RAGQueryResponse:
         """Execute RAG query and return citations.
 
@@ -262,61 +508,100 @@ class RAGService:
             transcript_text: Transcript window text
             window_index: Window index for ordering
             transcript_id: Optional Convex transcript ID
+            include_keywords: Extract keywords for the query metadata (callers that
+                don't read them skip the extraction)
 
         Returns:
             RAG query response with citations
         """
         start_time = time.time()
-        logger.info(f"[RAG] Starting query for session {session_id}, window {window_index}")
-        logger.debug(f"[RAG] Transcript text: {transcript_text[:100]}...")
+        logger.info("[RAG] Starting query for session %s, window %d", session_id, window_index)
+        logger.debug("[RAG] Transcript text: %.100s...", transcript_text)
+
+        # Step 1: Keywords for short windows (long ones are mostly their keywords) are
+        # extracted in the background. They only feed the query metadata, so they
+        # overlap the whole retrieval instead of delaying the search.
+        keyword_task = None
+        if include_keywords and len(transcript_text.split()) < settings.rag_enrichment_max_words:
+            keyword_task = asyncio.create_task(
+                self._run_cpu(self.query_enrichment.extract_keywords, transcript_text)
+            )
 
-        # Step 1: Enrich query with KeyBERT keywords
-        enrichment = self.query_enrichment.enrich_query(transcript_text)
-        enriched_query = enrichment["enriched_query"]
-        logger.debug(f"[RAG] Keywords: {enrichment['keywords']}")
+        try:
+            citations = await self._retrieve(
+                session_id, transcript_text, window_index, transcript_id
+            )
+        except BaseException:
+            # Don't leave the keyword task queued on the CPU pool, and retrieve its
+            # outcome so a failure there isn't reported as never retrieved
+            if keyword_task is not None:
+                keyword_task.cancel()
+                await asyncio.gather(keyword_task, return_exceptions=True)
+            raise
+
+        keywords: List[str] = []
+        if keyword_task is not None:
+            keywords = await keyword_task
+            logger.debug("[RAG] Keywords: %s", keywords)
 
-        # Step 2: Generate embedding locally with bge-base-en-v1.5
-        query_embedding = self.embedding_service.create_embedding(enriched_query)
-        logger.debug(f"[RAG] Generated embedding with {len(query_embedding)} dimensions")
+        processing_time = int((time.time() - start_time) * 1000)
+        logger.info("[RAG] Pipeline completed in %dms", processing_time)
 
-        # Step 3: Search Pinecone for top 5 candidates
-        search_results = await self.pinecone_client.query(
-            collection_name="documents",
-            query_embeddings=[query_embedding],
-            n_results=settings.rag_top_k_candidates,
-            where={"session_id": session_id},  # Filter by Convex session ID (string)
+        return RAGQueryResponse(
+            window_index=window_index,
+            citations=citations,
+            query_metadata=QueryMetadata(
+                keywords=keywords,
+                processing_time_ms=processing_time,
+            ),
         )
 
-        # Build candidate list from Pinecone results
-        candidates = self._build_candidates(search_results)
-        logger.info(f"[RAG] Pinecone returned {len(candidates)} candidates")
+    async def _retrieve(
+        self,
+        session_id: str,
+        transcript_text: str,
+        window_index: int,
+        transcript_id: Optional[str],
+    ) -> List[CitationResult]:
+        """Find, rank and store the citations for a transcript window (steps 2-6)."""
+        # Step 2-3: Embed and search, unless this window was already seen
+        cache_key = (session_id, _text_digest(transcript_text))
+        with self._query_cache_lock:
+            cached = self._query_cache.get(cache_key)
+        if cached is not None:
+            # Re-ranking annotates candidates in place, so hand out copies
+            candidates = copy.deepcopy(cached)
+            logger.info("[RAG] Query cache hit, reusing %d candidates", len(candidates))
+        else:
+            candidates = await self._search(session_id, transcript_text)
+            with self._query_cache_lock:
+                self._query_cache[cache_key] = copy.deepcopy(candidates)
 
         # Step 4: Distance-based early exit
         if self._should_early_exit(candidates):
-            processing_time = int((time.time() - start_time) * 1000)
-            logger.info(f"[RAG] Early exit - no candidates within distance threshold")
-            return RAGQueryResponse(
-                window_index=window_index,
-                citations=[],
-                query_metadata=QueryMetadata(
-                    keywords=enrichment["keywords"],
-                    expanded_concepts=[],
-                    processing_time_ms=processing_time,
-                ),
-            )
+            logger.info("[RAG] Early exit - no candidates within distance threshold")
+            return []
 
-        # Step 5: Re-rank candidates with TinyBERT cross-encoder
-        reranked = self.reranker.rerank(
-            query=transcript_text,
-            candidates=candidates,
-            top_k=settings.rag_top_k_results,
-        )
-        logger.info(f"[RAG] Re-ranked to {len(reranked)} citations above threshold")
+        # Step 5: Re-rank candidates with TinyBERT cross-encoder, unless the
+        # bi-encoder already found one clear match
+        if self._has_strong_match(candidates):
+            reranked = _rank_by_distance(
+                self._strong_candidates(candidates), settings.rag_top_k_results
+            )
+            logger.info("[RAG] Strong match - skipped re-ranking, %d citations", len(reranked))
+        else:
+            reranked = await self._run_cpu(
+                self.reranker.rerank,
+                query=transcript_text,
+                candidates=candidates,
+                top_k=settings.rag_top_k_results,
+            )
+            logger.info("[RAG] Re-ranked to %d citations above threshold", len(reranked))
 
-        # Step 6: Build citations from Pinecone metadata
+        # Build citations from Pinecone metadata
         citations = self._build_citations(reranked)
 
-        # Step 7: Store citations in Convex (async, best-effort)
+        # Step 6: Store citations in Convex (async, best-effort)
         if citations:
             await self._store_citations_in_convex(
                 session_id=session_id,
@@ -324,42 +609,45 @@ class RAGService:
                 citations=citations,
                 window_index=window_index,
             )
+        return citations
 
-        processing_time = int((time.time() - start_time) * 1000)
-        logger.info(f"[RAG] Pipeline completed in {processing_time}ms")
+    async def _search(self, session_id: str, transcript_text: str) -> List[dict]:
+        """Embed the transcript locally, then search Pinecone (steps 2-3)."""
+        query_embedding = await self._run_cpu(
+            self.embedding_service.create_embedding, transcript_text
+        )
+        return await self._search_pinecone(session_id, query_embedding)
 
-        return RAGQueryResponse(
-            window_index=window_index,
-            citations=citations,
-            query_metadata=QueryMetadata(
-                keywords=enrichment["keywords"],
-                expanded_concepts=[],
-                processing_time_ms=processing_time,
-            ),
+    async def _search_pinecone(self, session_id: str, query_embedding: np.ndarray) -> List[dict]:
+        """Search Pinecone for the top candidates in a session."""
+        hits = await self.pinecone_client.query(
+            collection_name="documents",
+            query_embeddings=[query_embedding],
+            n_results=settings.rag_top_k_candidates,
+            where={"session_id": session_id},  # Filter by Convex session ID (string)
         )
 
-    def _build_candidates(self, search_results: dict) -> List[dict]:
-        """Build candidate list from Pinecone search results."""
-        candidates = []
-        
-        result_ids = search_results.get("ids", [[]])[0]
-        result_docs = search_results.get("documents", [[]])[0] if search_results.get("documents") else []
-        result_metas = search_results.get("metadatas", [[]])[0] if search_results.get("metadatas") else []
-        result_dists = search_results.get("distances", [[]])[0] if search_results.get("distances") else []
-
-        for i in range(len(result_ids)):
-            candidate = {
-                "id": result_ids[i],
-                "text": result_docs[i] if i < len(result_docs) else "",
-                "metadata": result_metas[i] if i < len(result_metas) else {},
-                "distance": result_dists[i] if i < len(result_dists) else 1.0,
-            }
-            candidates.append(candidate)
-            
-            if i < 3:  # Log first 3 for debugging
+        # Build candidate list from Pinecone hits
+        candidates = self._build_candidates(hits)
+        logger.info("[RAG] Pinecone returned %d candidates", len(candidates))
+        return candidates
+
+    def _build_candidates(self, hits: PineconeHits) -> List[dict]:
+        """Build candidate list from Pinecone hits."""
+        candidates = [
+            {"id": vec_id, "text": doc, "metadata": meta, "distance": dist}
+            for vec_id, doc, meta, dist in zip(
+                hits.ids, hits.documents, hits.metadatas, hits.distances.tolist()
+            )
+        ]
+
+        if logger.isEnabledFor(logging.DEBUG):
+            for i, candidate in enumerate(candidates[:3]):  # Log first 3 for debugging
                 logger.debug(
-                    f"[RAG] Candidate {i}: distance={candidate['distance']:.3f}, "
-                    f"doc={candidate['metadata'].get('document_name', 'N/A')}"
+                    "[RAG] Candidate %d: distance=%.3f, doc=%s",
+                    i,
+                    candidate["distance"],
+                    candidate["metadata"].get("document_name", "N/A"),
                 )
 
         return candidates
@@ -372,19 +660,47 @@ class RAGService:
         if not candidates:
             return True
             
-        distances = [c.get("distance", float("inf")) for c in candidates]
-        min_distance = min(distances)
+        min_distance = float(_candidate_distances(candidates, np.inf).min())
         
         should_exit = min_distance > settings.rag_distance_threshold
         
         if should_exit:
             logger.debug(
-                f"[RAG] Early exit: min_distance={min_distance:.3f} > "
-                f"threshold={settings.rag_distance_threshold}"
+                "[RAG] Early exit: min_distance=%.3f > threshold=%s",
+                min_distance,
+                settings.rag_distance_threshold,
             )
         
         return should_exit
 
+    def _has_strong_match(self, candidates: List[dict]) -> bool:
+        """Check if the closest candidate is confident enough to skip re-ranking.
+        
+        The counterpart of the early exit: if the best distance is below the strong-match
+        threshold and clearly ahead of the runner-up, the cross-encoder would not change
+        the winner.
+        """
+        distances = np.sort(_candidate_distances(candidates, np.inf))
+        if len(distances) == 0 or distances[0] >= settings.rag_strong_match_distance:
+            return False
+        if len(distances) == 1:
+            return True
+
+        gap = float(distances[1] - distances[0])
+        logger.debug("[RAG] Best distance=%.3f, gap to runner-up=%.3f", distances[0], gap)
+        return gap > settings.rag_strong_match_gap
+
+    def _strong_candidates(self, candidates: List[dict]) -> List[dict]:
+        """Candidates close enough to cite without re-ranking, nearest first.
+        
+        Stands in for the reranker's relevance threshold on the distance scale: only
+        candidates within the strong-match distance plus gap are kept. Their 1 - d/2
+        scores are then well above rag_relevance_threshold.
+        """
+        max_distance = settings.rag_strong_match_distance + settings.rag_strong_match_gap
+        close = [c for c in candidates if c.get("distance", np.inf) <= max_distance]
+        return sorted(close, key=lambda c: c["distance"])
+
     def _build_citations(self, reranked: List[dict]) -> List[CitationResult]:
         """Build citation results from Pinecone metadata.
         
@@ -403,7 +719,7 @@ class RAGService:
             section_heading = metadata.get("section_heading")
             
             if not document_id:
-                logger.warning(f"[RAG] No document_id in metadata for candidate: {candidate['id']}")
+                logger.warning("[RAG] No document_id in metadata for candidate: %s", candidate["id"])
                 continue
 
             citations.append(
@@ -419,8 +735,11 @@ class RAGService:
             )
             
             logger.debug(
-                f"[RAG] Citation {rank}: {document_name} p.{page_number} "
-                f"(score: {relevance_score:.3f})"
+                "[RAG] Citation %d: %s p.%s (score: %.3f)",
+                rank,
+                document_name,
+                page_number,
+                relevance_score,
             )
 
         return citations
@@ -455,8 +774,30 @@ class RAGService:
                 session_id=session_id,
                 citations=citations_data,
             )
-            logger.debug(f"[RAG] Stored {len(citations)} citations in Convex")
+            logger.debug("[RAG] Stored %d citations in Convex", len(citations))
             
         except Exception as e:
             # Don't fail the RAG query if Convex storage fails
-            logger.error(f"[RAG] Failed to store citations in Convex: {e}")
+            logger.error("[RAG] Failed to store citations in Convex: %s", e)
+
+
+# Singleton instance
+_rag_service: Optional[RAGService] = None
+
+
+def get_rag_service() -> RAGService:
+    """Get or create the RAG service singleton.
+
+    Models are loaded once per process and shared by the HTTP and WebSocket routes.
+    """
+    global _rag_service
+    if _rag_service is None:
+        embedding_service = get_local_embedding_service()
+        _rag_service = RAGService(
+            get_pinecone_client(),
+            embedding_service,
+            get_convex_client(),
+            RerankerService(),
+            QueryEnrichmentService(KeywordExtractor(embedding_service)),
+        )
+    return _rag_service
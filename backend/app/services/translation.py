@@ -3,7 +3,7 @@
 import logging
 from typing import AsyncGenerator
 
-from app.external.elevenlabs import ElevenLabsClient, ElevenLabsS2SStream
+from app.external.elevenlabs import AudioBuffer, ElevenLabsClient, ElevenLabsS2SStream
 
 logger = logging.getLogger(__name__)
 
@@ -37,13 +37,14 @@ class TranslationService:
     async def translate_chunk(
         self,
         stream: ElevenLabsS2SStream,
-        audio_chunk: bytes,
+        audio_chunk: AudioBuffer,
     ) -> AsyncGenerator[bytes, None]:
         """Send audio chunk and receive translated audio.
 
         Args:
             stream: Active translation stream
-            audio_chunk: PCM audio chunk to translate
+            audio_chunk: PCM audio chunk to translate (bytes, bytearray or a
+                memoryview slice of a larger capture buffer)
 
         Yields:
             Translated audio chunks
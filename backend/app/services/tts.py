@@ -1,10 +1,15 @@
 """Text-to-speech service using ElevenLabs."""
 
+import asyncio
+import hashlib
 import logging
+from typing import AsyncGenerator, AsyncIterator, Optional
 
+from cachetools import LRUCache
 from fastapi import HTTPException, status
 
-from app.external.elevenlabs import ElevenLabsClient
+from app.core.config import settings
+from app.external.elevenlabs import ElevenLabsClient, get_elevenlabs_client
 
 logger = logging.getLogger(__name__)
 
@@ -14,10 +19,17 @@ class TTSService:
 
     def __init__(self, elevenlabs_client: ElevenLabsClient):
         self.elevenlabs_client = elevenlabs_client
+        # UI prompts and short phrases repeat; keyed on a digest of (text, voice, model).
+        # Only touched from the event loop, so no lock is needed.
+        self._cache: LRUCache = LRUCache(maxsize=settings.tts_cache_size)
+        # Syntheses of cacheable texts in progress, shared by concurrent requests
+        self._inflight: dict[bytes, asyncio.Task[bytes]] = {}
 
     async def speak(self, text: str, voice_id: str | None = None) -> bytes:
         """Convert text to speech and return audio bytes.
 
+        Prefer stream_speech() when the audio is passed straight to a client.
+
         Args:
             text: Text to convert to speech
             voice_id: Optional ElevenLabs voice ID (uses default if not provided)
@@ -25,6 +37,108 @@ class TTSService:
         Returns:
             Audio bytes in MP3 format
         """
+        chunks = [chunk async for chunk in await self.stream_speech(text, voice_id=voice_id)]
+        return b"".join(chunks)
+
+    async def stream_speech(
+        self, text: str, voice_id: str | None = None
+    ) -> AsyncIterator[bytes]:
+        """Convert text to speech, streaming audio as it is synthesized.
+
+        The first chunk is fetched before returning, so request errors (rate
+        limits, bad credentials) still surface as HTTP errors instead of
+        breaking a response that has already started.
+
+        Args:
+            text: Text to convert to speech
+            voice_id: Optional ElevenLabs voice ID (uses default if not provided)
+
+        Returns:
+            Async iterator of MP3 audio chunks
+        """
+        self._validate_text(text)
+
+        cache_key = self._cache_key(text, voice_id)
+        if cache_key is not None:
+            # Short clips are synthesized whole so they can be cached and shared
+            audio = await self._cached_speech(cache_key, text, voice_id)
+            return self._replay(audio)
+
+        stream = self.elevenlabs_client.text_to_speech_stream(text, voice_id=voice_id)
+        try:
+            first_chunk = await anext(stream, b"")
+        except Exception as e:
+            await stream.aclose()
+            logger.error(f"TTS failed: {e}")
+            raise self._tts_error(e)
+
+        logger.info(f"Streaming TTS audio for {len(text)} characters")
+        return self._resume_stream(first_chunk, stream)
+
+    async def _resume_stream(
+        self, first_chunk: bytes, stream: AsyncGenerator[bytes, None]
+    ) -> AsyncGenerator[bytes, None]:
+        """Yield the prefetched chunk followed by the rest of the stream."""
+        try:
+            if first_chunk:
+                yield first_chunk
+            async for chunk in stream:
+                yield chunk
+        finally:
+            await stream.aclose()
+
+    async def _cached_speech(
+        self, cache_key: bytes, text: str, voice_id: str | None
+    ) -> bytes:
+        """Return cached audio, or synthesize it once for all concurrent callers."""
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"TTS cache hit for {len(text)} characters")
+            return cached
+
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(self._synthesize(text, voice_id))
+            task.add_done_callback(lambda done: self._finish_synthesis(cache_key, done))
+            self._inflight[cache_key] = task
+        else:
+            logger.debug(f"Joining in-flight TTS for {len(text)} characters")
+
+        # Shielded so one caller disconnecting doesn't cancel the others' audio
+        return await asyncio.shield(task)
+
+    async def _synthesize(self, text: str, voice_id: str | None) -> bytes:
+        """Synthesize a whole clip, mapping failures to HTTP errors."""
+        try:
+            return await self.elevenlabs_client.text_to_speech(text, voice_id=voice_id)
+        except Exception as e:
+            logger.error(f"TTS failed: {e}")
+            raise self._tts_error(e)
+
+    def _finish_synthesis(self, cache_key: bytes, task: "asyncio.Task[bytes]") -> None:
+        """Release the in-flight entry and cache the audio if synthesis succeeded."""
+        self._inflight.pop(cache_key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        # An empty upstream body would otherwise be replayed as silence for this text
+        audio = task.result()
+        if audio:
+            self._cache[cache_key] = audio
+
+    async def _replay(self, audio: bytes) -> AsyncGenerator[bytes, None]:
+        """Yield cached audio as a single chunk."""
+        yield audio
+
+    def _cache_key(self, text: str, voice_id: str | None) -> Optional[bytes]:
+        """Return the cache key for short texts, or None if the text isn't cached."""
+        if len(text) > settings.tts_cache_max_chars:
+            return None
+        voice_id = voice_id or settings.elevenlabs_voice_id
+        key_source = "\x00".join((text, voice_id, settings.elevenlabs_model_id))
+        return hashlib.blake2b(key_source.encode("utf-8"), digest_size=16).digest()
+
+    def _validate_text(self, text: str) -> None:
+        """Reject empty or overlong TTS input."""
         if not text or not text.strip():
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -37,29 +151,38 @@ class TTSService:
                 detail={"code": "TEXT_TOO_LONG", "message": "Input exceeds 1000 characters"},
             )
 
-        try:
-            audio_bytes = await self.elevenlabs_client.text_to_speech(text, voice_id=voice_id)
-            logger.info(f"Generated TTS audio for {len(text)} characters")
-            return audio_bytes
+    def _tts_error(self, error: Exception) -> HTTPException:
+        """Map an ElevenLabs failure to an HTTP error."""
+        # Check for specific error types
+        error_str = str(error).lower()
+        if "rate limit" in error_str or "429" in error_str:
+            return HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail={"code": "TTS_RATE_LIMIT", "message": "TTS rate limit exceeded"},
+            )
 
-        except Exception as e:
-            logger.error(f"TTS failed: {e}")
+        if "unauthorized" in error_str or "401" in error_str:
+            return HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail={"code": "TTS_UNAVAILABLE", "message": "TTS service configuration error"},
+            )
 
-            # Check for specific error types
-            error_str = str(e).lower()
-            if "rate limit" in error_str or "429" in error_str:
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail={"code": "TTS_RATE_LIMIT", "message": "TTS rate limit exceeded"},
-                )
+        return HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"code": "TTS_ERROR", "message": "TTS request failed"},
+        )
 
-            if "unauthorized" in error_str or "401" in error_str:
-                raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail={"code": "TTS_UNAVAILABLE", "message": "TTS service configuration error"},
-                )
 
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail={"code": "TTS_ERROR", "message": "TTS request failed"},
-            )
+# Singleton instance
+_tts_service: Optional[TTSService] = None
+
+
+def get_tts_service() -> TTSService:
+    """Get or create the TTS service singleton.
+
+    Shared across requests so the audio cache persists.
+    """
+    global _tts_service
+    if _tts_service is None:
+        _tts_service = TTSService(get_elevenlabs_client())
+    return _tts_service
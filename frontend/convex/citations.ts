@@ -1,7 +1,22 @@
 import { v } from "convex/values";
-import { query, mutation, internalMutation, internalQuery } from "./_generated/server";
+import { query, mutation, internalMutation, internalQuery, QueryCtx } from "./_generated/server";
+import { Doc, Id } from "./_generated/dataModel";
 import { getAuthUserId } from "@convex-dev/auth/server";
 
+// Attach document names, reading each referenced document once
+export async function withDocumentNames<T extends Doc<"citations">>(ctx: QueryCtx, citations: T[]) {
+  const documentIds = [...new Set(citations.map((citation) => citation.documentId))];
+  const documents = await Promise.all(documentIds.map((id) => ctx.db.get(id)));
+  const names = new Map<Id<"documents">, string>(
+    documentIds.map((id, i) => [id, documents[i]?.name ?? "Unknown"])
+  );
+
+  return citations.map((citation) => ({
+    ...citation,
+    documentName: names.get(citation.documentId) ?? "Unknown",
+  }));
+}
+
 // List citations by session
 export const listBySession = query({
   args: { sessionId: v.id("sessions") },
@@ -21,15 +36,7 @@ export const listBySession = query({
       .collect();
 
     // Enrich with document info
-    return Promise.all(
-      citations.map(async (citation) => {
-        const document = await ctx.db.get(citation.documentId);
-        return {
-          ...citation,
-          documentName: document?.name ?? "Unknown",
-        };
-      })
-    );
+    return withDocumentNames(ctx, citations);
   },
 });
 
@@ -51,23 +58,14 @@ export const listByTranscript = query({
       throw new Error("Not authorized");
     }
 
+    // The index returns citations in rank order
     const citations = await ctx.db
       .query("citations")
-      .withIndex("by_transcript", (q) => q.eq("transcriptId", args.transcriptId))
+      .withIndex("by_transcript_rank", (q) => q.eq("transcriptId", args.transcriptId))
       .collect();
 
-    // Sort by rank and enrich with document info
-    const enriched = await Promise.all(
-      citations.map(async (citation) => {
-        const document = await ctx.db.get(citation.documentId);
-        return {
-          ...citation,
-          documentName: document?.name ?? "Unknown",
-        };
-      })
-    );
-
-    return enriched.sort((a, b) => a.rank - b.rank);
+    // Enrich with document info
+    return withDocumentNames(ctx, citations);
   },
 });
 
@@ -84,24 +82,16 @@ export const getByWindowIndex = query({
       throw new Error("Session not found");
     }
 
+    // The index narrows to the window and returns citations in rank order
     const citations = await ctx.db
       .query("citations")
-      .withIndex("by_session", (q) => q.eq("sessionId", args.sessionId))
-      .filter((q) => q.eq(q.field("windowIndex"), args.windowIndex))
+      .withIndex("by_session_window_rank", (q) =>
+        q.eq("sessionId", args.sessionId).eq("windowIndex", args.windowIndex)
+      )
       .collect();
 
-    // Sort by rank and enrich with document info
-    const enriched = await Promise.all(
-      citations.map(async (citation) => {
-        const document = await ctx.db.get(citation.documentId);
-        return {
-          ...citation,
-          documentName: document?.name ?? "Unknown",
-        };
-      })
-    );
-
-    return enriched.sort((a, b) => a.rank - b.rank);
+    // Enrich with document info
+    return withDocumentNames(ctx, citations);
   },
 });
 
@@ -131,16 +121,15 @@ export const addBatch = mutation({
       throw new Error("Session not found");
     }
 
-    const ids = [];
-    for (const citation of args.citations) {
-      const id = await ctx.db.insert("citations", {
-        sessionId: args.sessionId,
-        ...citation,
-      });
-      ids.push(id);
-    }
-
-    return ids;
+    // Inserts are issued together; the mutation commits them in one transaction
+    return Promise.all(
+      args.citations.map((citation) =>
+        ctx.db.insert("citations", {
+          sessionId: args.sessionId,
+          ...citation,
+        })
+      )
+    );
   },
 });
 
@@ -177,16 +166,11 @@ export const getUniqueForNotes = query({
       (a, b) => b.relevanceScore - a.relevanceScore
     );
 
-    return Promise.all(
-      sorted.map(async (citation, index) => {
-        const document = await ctx.db.get(citation.documentId);
-        return {
-          ...citation,
-          documentName: document?.name ?? "Unknown",
-          citationNumber: index + 1,
-        };
-      })
-    );
+    const enriched = await withDocumentNames(ctx, sorted);
+    return enriched.map((citation, index) => ({
+      ...citation,
+      citationNumber: index + 1,
+    }));
   },
 });
 
@@ -218,22 +202,21 @@ export const addBatchFromBackend = internalMutation({
       throw new Error("Session not found");
     }
 
-    const ids = [];
-    for (const citation of args.citations) {
-      const id = await ctx.db.insert("citations", {
-        sessionId: args.sessionId,
-        transcriptId: citation.transcriptId,
-        documentId: citation.documentId,
-        pageNumber: citation.pageNumber,
-        chunkText: citation.chunkText,
-        relevanceScore: citation.relevanceScore,
-        rank: citation.rank,
-        windowIndex: citation.windowIndex,
-      });
-      ids.push(id);
-    }
-
-    return ids;
+    // Inserts are issued together; the mutation commits them in one transaction
+    return Promise.all(
+      args.citations.map((citation) =>
+        ctx.db.insert("citations", {
+          sessionId: args.sessionId,
+          transcriptId: citation.transcriptId,
+          documentId: citation.documentId,
+          pageNumber: citation.pageNumber,
+          chunkText: citation.chunkText,
+          relevanceScore: citation.relevanceScore,
+          rank: citation.rank,
+          windowIndex: citation.windowIndex,
+        })
+      )
+    );
   },
 });
 
@@ -247,14 +230,6 @@ export const listBySessionInternal = internalQuery({
       .collect();
 
     // Enrich with document info
-    return Promise.all(
-      citations.map(async (citation) => {
-        const document = await ctx.db.get(citation.documentId);
-        return {
-          ...citation,
-          documentName: document?.name ?? "Unknown",
-        };
-      })
-    );
+    return withDocumentNames(ctx, citations);
   },
 });
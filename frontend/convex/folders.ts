@@ -1,6 +1,7 @@
 import { v } from "convex/values";
 import { query, mutation } from "./_generated/server";
 import { getAuthUserId } from "@convex-dev/auth/server";
+import { deleteSessionWithContents } from "./sessions";
 
 // List all active folders for authenticated user
 export const list = query({
@@ -128,41 +129,9 @@ export const remove = mutation({
       .withIndex("by_folder", (q) => q.eq("folderId", args.id))
       .collect();
 
-    for (const session of sessions) {
-      // Delete documents and their files
-      const documents = await ctx.db
-        .query("documents")
-        .withIndex("by_session", (q) => q.eq("sessionId", session._id))
-        .collect();
-
-      for (const doc of documents) {
-        await ctx.storage.delete(doc.storageId);
-        await ctx.db.delete(doc._id);
-      }
-
-      // Delete transcripts
-      const transcripts = await ctx.db
-        .query("transcripts")
-        .withIndex("by_session", (q) => q.eq("sessionId", session._id))
-        .collect();
-      for (const t of transcripts) await ctx.db.delete(t._id);
-
-      // Delete citations
-      const citations = await ctx.db
-        .query("citations")
-        .withIndex("by_session", (q) => q.eq("sessionId", session._id))
-        .collect();
-      for (const c of citations) await ctx.db.delete(c._id);
-
-      // Delete notes
-      const notes = await ctx.db
-        .query("notes")
-        .withIndex("by_session", (q) => q.eq("sessionId", session._id))
-        .collect();
-      for (const n of notes) await ctx.db.delete(n._id);
-
-      await ctx.db.delete(session._id);
-    }
+    await Promise.all(
+      sessions.map((session) => deleteSessionWithContents(ctx, session._id))
+    );
 
     await ctx.db.delete(args.id);
   },
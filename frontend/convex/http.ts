@@ -52,6 +52,55 @@ http.route({
   }),
 });
 
+// Add a batch of transcript segments from backend
+http.route({
+  path: "/api/transcripts/batch",
+  method: "POST",
+  handler: httpAction(async (ctx, request) => {
+    try {
+      const body = await request.json();
+      const { sessionId, transcripts } = body;
+
+      if (!sessionId || !transcripts || !Array.isArray(transcripts)) {
+        return new Response(
+          JSON.stringify({ error: "Missing sessionId or transcripts array" }),
+          { status: 400, headers: { "Content-Type": "application/json" } }
+        );
+      }
+
+      const transformedTranscripts = transcripts.map((t: {
+        originalText: string;
+        translatedText?: string;
+        timestamp: number;
+        windowIndex: number;
+        isFinal?: boolean;
+      }) => ({
+        originalText: t.originalText,
+        translatedText: t.translatedText,
+        timestamp: t.timestamp,
+        windowIndex: t.windowIndex,
+        isFinal: t.isFinal ?? true,
+      }));
+
+      const ids = await ctx.runMutation(internal.transcripts.addBatchFromBackend, {
+        sessionId: sessionId as Id<"sessions">,
+        transcripts: transformedTranscripts,
+      });
+
+      return new Response(
+        JSON.stringify({ success: true, transcriptIds: ids }),
+        { status: 200, headers: { "Content-Type": "application/json" } }
+      );
+    } catch (error) {
+      console.error("Error adding transcripts:", error);
+      return new Response(
+        JSON.stringify({ error: String(error) }),
+        { status: 500, headers: { "Content-Type": "application/json" } }
+      );
+    }
+  }),
+});
+
 // Get full transcript text for note generation
 http.route({
   path: "/api/transcripts/full-text",
@@ -86,6 +135,40 @@ http.route({
   }),
 });
 
+// Get transcript text and citations together for note generation
+http.route({
+  path: "/api/sessions/note-context",
+  method: "POST",
+  handler: httpAction(async (ctx, request) => {
+    try {
+      const body = await request.json();
+      const { sessionId } = body;
+
+      if (!sessionId) {
+        return new Response(
+          JSON.stringify({ error: "Missing sessionId" }),
+          { status: 400, headers: { "Content-Type": "application/json" } }
+        );
+      }
+
+      const result = await ctx.runQuery(internal.transcripts.getNoteContextInternal, {
+        sessionId: sessionId as Id<"sessions">,
+      });
+
+      return new Response(
+        JSON.stringify(result),
+        { status: 200, headers: { "Content-Type": "application/json" } }
+      );
+    } catch (error) {
+      console.error("Error getting note context:", error);
+      return new Response(
+        JSON.stringify({ error: String(error) }),
+        { status: 500, headers: { "Content-Type": "application/json" } }
+      );
+    }
+  }),
+});
+
 // Add batch of citations
 http.route({
   path: "/api/citations/batch",
@@ -93,7 +93,8 @@ const schema = defineSchema({
     windowIndex: v.number(),
   })
     .index("by_session", ["sessionId"])
-    .index("by_transcript", ["transcriptId"])
+    .index("by_session_window_rank", ["sessionId", "windowIndex", "rank"])
+    .index("by_transcript_rank", ["transcriptId", "rank"])
     .index("by_document", ["documentId"]),
 
   // Notes - Generated lecture notes
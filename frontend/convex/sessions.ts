@@ -1,7 +1,43 @@
 import { v } from "convex/values";
-import { query, mutation } from "./_generated/server";
+import { query, mutation, MutationCtx } from "./_generated/server";
+import { Id } from "./_generated/dataModel";
 import { getAuthUserId } from "@convex-dev/auth/server";
 
+// Delete a session with its documents, files, transcripts, citations and notes
+export async function deleteSessionWithContents(
+  ctx: MutationCtx,
+  sessionId: Id<"sessions">
+) {
+  // Read all session contents together
+  const [documents, transcripts, citations, notes] = await Promise.all([
+    ctx.db
+      .query("documents")
+      .withIndex("by_session", (q) => q.eq("sessionId", sessionId))
+      .collect(),
+    ctx.db
+      .query("transcripts")
+      .withIndex("by_session", (q) => q.eq("sessionId", sessionId))
+      .collect(),
+    ctx.db
+      .query("citations")
+      .withIndex("by_session", (q) => q.eq("sessionId", sessionId))
+      .collect(),
+    ctx.db
+      .query("notes")
+      .withIndex("by_session", (q) => q.eq("sessionId", sessionId))
+      .collect(),
+  ]);
+
+  // Deletes are issued together; the mutation commits them in one transaction
+  await Promise.all([
+    ...documents.map((doc) => ctx.storage.delete(doc.storageId)),
+    ...[...documents, ...transcripts, ...citations, ...notes].map((row) =>
+      ctx.db.delete(row._id)
+    ),
+    ctx.db.delete(sessionId),
+  ]);
+}
+
 // List sessions by folder
 export const listByFolder = query({
   args: { folderId: v.id("folders") },
@@ -162,6 +198,9 @@ export const end = mutation({
       throw new Error("Session not found");
     }
 
+    // Ending twice is a no-op; keep the original end time
+    if (session.status === "completed") return;
+
     await ctx.db.patch(args.id, {
       status: "completed",
       endedAt: Date.now(),
@@ -181,38 +220,6 @@ export const remove = mutation({
       throw new Error("Session not found");
     }
 
-    // Delete documents and their files
-    const documents = await ctx.db
-      .query("documents")
-      .withIndex("by_session", (q) => q.eq("sessionId", args.id))
-      .collect();
-
-    for (const doc of documents) {
-      await ctx.storage.delete(doc.storageId);
-      await ctx.db.delete(doc._id);
-    }
-
-    // Delete transcripts
-    const transcripts = await ctx.db
-      .query("transcripts")
-      .withIndex("by_session", (q) => q.eq("sessionId", args.id))
-      .collect();
-    for (const t of transcripts) await ctx.db.delete(t._id);
-
-    // Delete citations
-    const citations = await ctx.db
-      .query("citations")
-      .withIndex("by_session", (q) => q.eq("sessionId", args.id))
-      .collect();
-    for (const c of citations) await ctx.db.delete(c._id);
-
-    // Delete notes
-    const notes = await ctx.db
-      .query("notes")
-      .withIndex("by_session", (q) => q.eq("sessionId", args.id))
-      .collect();
-    for (const n of notes) await ctx.db.delete(n._id);
-
-    await ctx.db.delete(args.id);
+    await deleteSessionWithContents(ctx, args.id);
   },
 });
@@ -1,6 +1,28 @@
 import { v } from "convex/values";
-import { query, mutation, internalMutation, internalQuery } from "./_generated/server";
+import { query, mutation, internalMutation, internalQuery, QueryCtx } from "./_generated/server";
+import { Id } from "./_generated/dataModel";
 import { getAuthUserId } from "@convex-dev/auth/server";
+import { withDocumentNames } from "./citations";
+
+// Join a session's final transcript segments into original and translated text.
+// Segments are iterated rather than collected, so only their text is retained.
+async function collectFullText(ctx: QueryCtx, sessionId: Id<"sessions">) {
+  const originalParts: string[] = [];
+  const translatedParts: string[] = [];
+
+  for await (const t of ctx.db
+    .query("transcripts")
+    .withIndex("by_session_time", (q) => q.eq("sessionId", sessionId))
+    .filter((q) => q.eq(q.field("isFinal"), true))) {
+    originalParts.push(t.originalText);
+    translatedParts.push(t.translatedText || t.originalText);
+  }
+
+  return {
+    originalText: originalParts.join(" "),
+    translatedText: translatedParts.join(" "),
+  };
+}
 
 // List transcripts by session
 export const listBySession = query({
@@ -119,18 +141,7 @@ export const getFullText = query({
       throw new Error("Session not found");
     }
 
-    const transcripts = await ctx.db
-      .query("transcripts")
-      .withIndex("by_session_time", (q) => q.eq("sessionId", args.sessionId))
-      .filter((q) => q.eq(q.field("isFinal"), true))
-      .collect();
-
-    const originalText = transcripts.map((t) => t.originalText).join(" ");
-    const translatedText = transcripts
-      .map((t) => t.translatedText || t.originalText)
-      .join(" ");
-
-    return { originalText, translatedText };
+    return collectFullText(ctx, args.sessionId);
   },
 });
 
@@ -166,6 +177,39 @@ export const addFromBackend = internalMutation({
   },
 });
 
+// Add a batch of transcripts from backend in one mutation (no auth - backend is trusted)
+export const addBatchFromBackend = internalMutation({
+  args: {
+    sessionId: v.id("sessions"),
+    transcripts: v.array(
+      v.object({
+        originalText: v.string(),
+        translatedText: v.optional(v.string()),
+        timestamp: v.number(),
+        windowIndex: v.number(),
+        isFinal: v.boolean(),
+      })
+    ),
+  },
+  handler: async (ctx, args) => {
+    // Verify session exists (but don't check user - backend is trusted)
+    const session = await ctx.db.get(args.sessionId);
+    if (!session) {
+      throw new Error("Session not found");
+    }
+
+    // Inserts are issued together; the mutation commits them in one transaction
+    return Promise.all(
+      args.transcripts.map((transcript) =>
+        ctx.db.insert("transcripts", {
+          sessionId: args.sessionId,
+          ...transcript,
+        })
+      )
+    );
+  },
+});
+
 // Get full transcript text for backend (no auth - backend is trusted)
 export const getFullTextInternal = internalQuery({
   args: { sessionId: v.id("sessions") },
@@ -175,18 +219,32 @@ export const getFullTextInternal = internalQuery({
       throw new Error("Session not found");
     }
 
-    const transcripts = await ctx.db
-      .query("transcripts")
-      .withIndex("by_session_time", (q) => q.eq("sessionId", args.sessionId))
-      .filter((q) => q.eq(q.field("isFinal"), true))
-      .collect();
+    return collectFullText(ctx, args.sessionId);
+  },
+});
+
+// Get transcript text and citations (with document names) for note generation
+// in a single query, so the backend needs one round trip instead of two
+export const getNoteContextInternal = internalQuery({
+  args: { sessionId: v.id("sessions") },
+  handler: async (ctx, args) => {
+    const session = await ctx.db.get(args.sessionId);
+    if (!session) {
+      throw new Error("Session not found");
+    }
 
-    const originalText = transcripts.map((t) => t.originalText).join(" ");
-    const translatedText = transcripts
-      .map((t) => t.translatedText || t.originalText)
-      .join(" ");
+    const [fullText, citations] = await Promise.all([
+      collectFullText(ctx, args.sessionId),
+      ctx.db
+        .query("citations")
+        .withIndex("by_session", (q) => q.eq("sessionId", args.sessionId))
+        .collect(),
+    ]);
 
-    return { originalText, translatedText };
+    return {
+      ...fullText,
+      citations: await withDocumentNames(ctx, citations),
+    };
   },
 });
 
@@ -72,14 +72,15 @@ export function SessionPage() {
   // End session mutation (FastAPI - triggers ML note generation)
   const endSessionMutation = useMutation({
     mutationFn: async (generateNotes: boolean) => {
-      // First, end the session in Convex
-      await endSessionConvex({ id: sessionId as any });
-      
-      // Then trigger note generation in FastAPI if requested
-      if (generateNotes) {
-        return await sessionApi.end(sessionId!, { generate_notes: true });
-      }
-      return null;
+      // End the session in Convex and trigger note generation in FastAPI
+      // together; generation reads transcripts, not the session status
+      const [, result] = await Promise.all([
+        endSessionConvex({ id: sessionId as any }),
+        generateNotes
+          ? sessionApi.end(sessionId!, { generate_notes: true })
+          : Promise.resolve(null),
+      ]);
+      return result;
     },
     onSuccess: async (_, generateNotes) => {
       setTranscribing(false);